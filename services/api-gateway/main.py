@@ -5,15 +5,19 @@ This service acts as a central entry point for all client requests,
 routing them to the appropriate backend services.
 """
 
+import asyncio
 import os
+import time
 import httpx
-from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
 from fastapi import FastAPI, Depends, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from pydantic import BaseModel
+from starlette.background import BackgroundTask
 import logging
 
 # Configure logging
@@ -30,10 +34,40 @@ SOCKET_SERVICE_URL = os.getenv("SOCKET_SERVICE_URL", "http://socket-service:8000
 SECRET_KEY = os.getenv("SECRET_KEY", "change-me-in-production")
 ALGORITHM = "HS256"
 
+# Headers that apply to a single connection and must not be forwarded;
+# host is rewritten by the upstream client
+HOP_BY_HOP_HEADERS = frozenset({
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailers", "transfer-encoding", "upgrade", "host",
+})
+
+# Decoded tokens are cached briefly so repeat requests skip verification
+TOKEN_CACHE_TTL = 30.0
+TOKEN_CACHE_SIZE = 4096
+
+# Connection pool and timeouts shared by the backend clients; each client
+# keeps its own pool of keep-alive connections to its service
+CLIENT_LIMITS = httpx.Limits(
+    max_connections=512,
+    max_keepalive_connections=128,
+    keepalive_expiry=30.0,
+)
+CLIENT_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+
 # Initialize API clients
-auth_client = httpx.AsyncClient(base_url=AUTH_SERVICE_URL, timeout=30.0)
-app_client = httpx.AsyncClient(base_url=MAIN_APP_URL, timeout=30.0)
-socket_client = httpx.AsyncClient(base_url=SOCKET_SERVICE_URL, timeout=30.0)
+auth_client = httpx.AsyncClient(base_url=AUTH_SERVICE_URL, timeout=CLIENT_TIMEOUT, limits=CLIENT_LIMITS)
+app_client = httpx.AsyncClient(base_url=MAIN_APP_URL, timeout=CLIENT_TIMEOUT, limits=CLIENT_LIMITS)
+socket_client = httpx.AsyncClient(base_url=SOCKET_SERVICE_URL, timeout=CLIENT_TIMEOUT, limits=CLIENT_LIMITS)
+
+# First path segment -> (client, replacement for that segment or None to keep
+# it); only matched when more of the path follows, as in "auth/..."
+SERVICE_ROUTES = {
+    "auth": (auth_client, "api/"),
+    "socket": (socket_client, None),
+}
+
+# Paths under api/ that belong to the auth service
+AUTH_API_PATHS = frozenset({"login", "register", "logout", "verify"})
 
 # Create FastAPI application
 app = FastAPI(
@@ -60,6 +94,10 @@ class TokenData(BaseModel):
     user_id: Optional[str] = None
 
 
+# Token -> (monotonic expiry, token data), least recently used first
+_token_cache: "OrderedDict[str, Tuple[float, TokenData]]" = OrderedDict()
+
+
 # Helper functions
 async def get_current_user(token: str = Depends(oauth2_scheme)):
     """Verify and decode JWT token to get current user information."""
@@ -68,6 +106,15 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    # Serve recently verified tokens from the cache
+    now = time.monotonic()
+    cached = _token_cache.get(token)
+    if cached is not None:
+        if cached[0] > now:
+            _token_cache.move_to_end(token)
+            return cached[1]
+        del _token_cache[token]
+    
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
@@ -75,20 +122,31 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         if username is None or user_id is None:
             raise credentials_exception
         token_data = TokenData(username=username, user_id=user_id)
-        return token_data
     except JWTError:
         raise credentials_exception
+    
+    # Never cache a token past its own expiry
+    ttl = TOKEN_CACHE_TTL
+    exp = payload.get("exp")
+    if exp is not None:
+        ttl = min(ttl, exp - time.time())
+    if ttl > 0:
+        _token_cache[token] = (now + ttl, token_data)
+        if len(_token_cache) > TOKEN_CACHE_SIZE:
+            _token_cache.popitem(last=False)
+    
+    return token_data
 
 
 # Middleware
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
     """Add processing time header to responses."""
-    import time
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
     response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(process_time)
+    # Seconds, as before, from the monotonic clock
+    process_time = (time.perf_counter_ns() - start_time) / 1_000_000_000
+    response.headers["X-Process-Time"] = f"{process_time:.6f}"
     return response
 
 
@@ -110,8 +168,13 @@ async def health():
 async def login(request: Request):
     """Forward login request to auth service."""
     try:
-        body = await request.json()
-        response = await auth_client.post("/api/login", json=body)
+        # Forward the body as sent, without decoding and re-encoding it
+        body = await request.body()
+        response = await auth_client.post(
+            "/api/login",
+            content=body,
+            headers={"content-type": request.headers.get("content-type", "application/json")},
+        )
         return Response(
             content=response.content,
             status_code=response.status_code,
@@ -126,8 +189,13 @@ async def login(request: Request):
 async def register(request: Request):
     """Forward registration request to auth service."""
     try:
-        body = await request.json()
-        response = await auth_client.post("/api/register", json=body)
+        # Forward the body as sent, without decoding and re-encoding it
+        body = await request.body()
+        response = await auth_client.post(
+            "/api/register",
+            content=body,
+            headers={"content-type": request.headers.get("content-type", "application/json")},
+        )
         return Response(
             content=response.content,
             status_code=response.status_code,
@@ -142,49 +210,60 @@ async def register(request: Request):
 @app.api_route("/{path:path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH"])
 async def api_gateway(path: str, request: Request):
     """Forward any request to the appropriate backend service."""
-    # Determine target service based on path
-    client = app_client
+    # Determine target service from the first path segment; a bare
+    # "auth" or "socket" with nothing after it goes to the main app
+    prefix, sep, rest = path.partition("/")
+    client, rewrite = app_client, None
+    if sep:
+        client, rewrite = SERVICE_ROUTES.get(prefix, (client, rewrite))
     target_path = path
     
-    # Special paths for auth service
-    if path.startswith("api/login") or path.startswith("api/register") or path.startswith("api/logout") or path.startswith("api/verify"):
-        client = auth_client
-    elif path.startswith("auth/"):
+    if rewrite is not None:
+        # Rewrite path, e.g. auth/login -> api/login for the auth service
+        target_path = rewrite + rest
+    elif prefix == "api" and rest.partition("/")[0] in AUTH_API_PATHS:
+        # Special paths for auth service
         client = auth_client
-        # Rewrite path for auth service
-        target_path = "api/" + path[5:]  # Remove 'auth/' prefix and add 'api/'
-    elif path.startswith("socket/"):
-        client = socket_client
 
     # Get request details
     method = request.method
     url = f"/{target_path}"
-    headers = dict(request.headers)
     
-    # Remove hop-by-hop headers
-    hop_by_hop_headers = [
-        "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
-        "te", "trailers", "transfer-encoding", "upgrade"
-    ]
-    for header in hop_by_hop_headers:
-        if header.lower() in headers:
-            del headers[header.lower()]
+    # Copy headers without the hop-by-hop ones
+    headers = {
+        key: value for key, value in request.headers.items()
+        if key not in HOP_BY_HOP_HEADERS
+    }
+    
+    # Stream a request body through instead of buffering it; requests
+    # without one, such as most GETs, must not go upstream chunked
+    content = None
+    if request.headers.get("content-length", "0") != "0" or "transfer-encoding" in request.headers:
+        content = request.stream()
     
     # Forward request with parameters, headers and body
-    body = await request.body()
+    upstream_request = client.build_request(
+        method=method,
+        url=url,
+        content=content,
+        headers=headers,
+        cookies=request.cookies,
+    )
     try:
-        response = await client.request(
-            method=method,
-            url=url,
-            content=body,
-            headers=headers,
-            cookies=request.cookies,
+        response = await client.send(
+            upstream_request,
+            stream=True,
             follow_redirects=True,
         )
-        return Response(
-            content=response.content,
+        # Stream the raw response back, closing upstream once it is sent
+        return StreamingResponse(
+            response.aiter_raw(),
             status_code=response.status_code,
-            headers=dict(response.headers),
+            headers={
+                key: value for key, value in response.headers.items()
+                if key.lower() not in HOP_BY_HOP_HEADERS
+            },
+            background=BackgroundTask(response.aclose),
         )
     except httpx.RequestError as exc:
         service_name = "Main app"
@@ -196,6 +275,20 @@ async def api_gateway(path: str, request: Request):
         raise HTTPException(status_code=503, detail=f"{service_name} unavailable")
 
 
+# Startup event handlers
+@app.on_event("startup")
+async def startup_event():
+    """Open a connection to each backend concurrently before traffic arrives."""
+    clients = {"Auth service": auth_client, "Main app": app_client, "Socket service": socket_client}
+    results = await asyncio.gather(
+        *(client.get("/health") for client in clients.values()),
+        return_exceptions=True,
+    )
+    for service_name, result in zip(clients, results):
+        if isinstance(result, Exception):
+            logger.warning(f"{service_name} not reachable at startup: {result}")
+
+
 # Shutdown event handlers
 @app.on_event("shutdown")
 async def shutdown_event():
@@ -2,9 +2,15 @@
 Tests for the API Gateway service.
 """
 
+import asyncio
+import time
+
+from fastapi import HTTPException
 from fastapi.testclient import TestClient
+from jose import jwt
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, AsyncMock, MagicMock
+import main
 from main import app
 
 client = TestClient(app)
@@ -70,13 +76,153 @@ def test_register(mock_auth_client):
 def test_api_gateway(mock_app_client):
     """Test generic API gateway endpoint."""
     # Configure mock
+    async def aiter_raw():
+        yield b'{"data": "test"}'
+
     mock_response = MagicMock()
-    mock_response.content = b'{"data": "test"}'
+    mock_response.aiter_raw = aiter_raw
+    mock_response.aclose = AsyncMock()
     mock_response.status_code = 200
     mock_response.headers = {"Content-Type": "application/json"}
-    mock_app_client.request.return_value = mock_response
+    mock_app_client.send = AsyncMock(return_value=mock_response)
 
     # Test API gateway endpoint
     response = client.get("/api/test")
     assert response.status_code == 200
-    assert response.json() == {"data": "test"} 
\ No newline at end of file
+    assert response.json() == {"data": "test"} 
+
+
+def make_upstream_response(body=b'{"data": "test"}'):
+    """Build a mock streamed upstream response."""
+    async def aiter_raw():
+        yield body
+
+    mock_response = MagicMock()
+    mock_response.aiter_raw = aiter_raw
+    mock_response.aclose = AsyncMock()
+    mock_response.status_code = 200
+    mock_response.headers = {"Content-Type": "application/json"}
+    return mock_response
+
+
+@pytest.fixture
+def upstream():
+    """Patch send on each backend client, keyed by service name."""
+    with patch.object(main.auth_client, "send", new_callable=AsyncMock) as auth_send, \
+            patch.object(main.app_client, "send", new_callable=AsyncMock) as app_send, \
+            patch.object(main.socket_client, "send", new_callable=AsyncMock) as socket_send:
+        sends = {"auth": auth_send, "app": app_send, "socket": socket_send}
+        for send in sends.values():
+            send.return_value = make_upstream_response()
+        yield sends
+
+
+def sent_request(upstream, service):
+    """Return the request forwarded to a service, checking no other got one."""
+    for name, send in upstream.items():
+        if name != service:
+            send.assert_not_called()
+    upstream[service].assert_awaited_once()
+    return upstream[service].call_args[0][0]
+
+
+@pytest.mark.parametrize("path, service, target", [
+    ("/auth/verify", "auth", "/api/verify"),
+    ("/auth/", "auth", "/api/"),
+    ("/socket/events", "socket", "/socket/events"),
+    ("/api/logout", "auth", "/api/logout"),
+    ("/api/agents", "app", "/api/agents"),
+    ("/authors", "app", "/authors"),
+    ("/auth", "app", "/auth"),
+    ("/socket", "app", "/socket"),
+])
+def test_api_gateway_routing(upstream, path, service, target):
+    """Test routing by path prefix, with bare service names going to the main app."""
+    response = client.get(path)
+    assert response.status_code == 200
+    assert sent_request(upstream, service).url.path == target
+
+
+
+def test_api_gateway_get_sends_no_body(upstream):
+    """Test a proxied GET is not sent upstream with a chunked body."""
+    response = client.get("/api/agents")
+    assert response.status_code == 200
+    forwarded = sent_request(upstream, "app")
+    assert "transfer-encoding" not in forwarded.headers
+    assert forwarded.headers.get("content-length", "0") == "0"
+
+
+def test_api_gateway_streams_request_body(upstream):
+    """Test a request body is forwarded with its length."""
+    response = client.post("/api/agents", content=b'{"name": "test"}')
+    assert response.status_code == 200
+    forwarded = sent_request(upstream, "app")
+    assert forwarded.headers["content-length"] == "16"
+    assert "transfer-encoding" not in forwarded.headers
+
+
+def make_token(user="testuser", expires_in=3600):
+    """Build a signed token for the gateway's secret."""
+    payload = {"sub": user, "user_id": f"id-{user}", "exp": int(time.time()) + expires_in}
+    return jwt.encode(payload, main.SECRET_KEY, algorithm=main.ALGORITHM)
+
+
+@pytest.fixture
+def token_cache():
+    """Start each token cache test from an empty cache."""
+    main._token_cache.clear()
+    yield main._token_cache
+    main._token_cache.clear()
+
+
+def test_token_cache_hit(token_cache):
+    """Test a cached token is served without decoding it again."""
+    token = make_token()
+    first = asyncio.run(main.get_current_user(token))
+
+    with patch("main.jwt.decode") as mock_decode:
+        second = asyncio.run(main.get_current_user(token))
+
+    mock_decode.assert_not_called()
+    assert second is first
+    assert second.user_id == "id-testuser"
+
+
+def test_token_cache_expiry_clamped_to_exp(token_cache):
+    """Test a token is not cached past its own expiry."""
+    token = make_token(expires_in=5)
+    before = time.monotonic()
+    asyncio.run(main.get_current_user(token))
+
+    expiry, _ = token_cache[token]
+    assert expiry <= before + 6
+    assert expiry < before + main.TOKEN_CACHE_TTL
+
+
+def test_token_cache_evicts_least_recently_used(token_cache):
+    """Test the cache drops its oldest entry at TOKEN_CACHE_SIZE."""
+    tokens = [make_token(user=f"user{i}") for i in range(3)]
+    with patch("main.TOKEN_CACHE_SIZE", 2):
+        asyncio.run(main.get_current_user(tokens[0]))
+        asyncio.run(main.get_current_user(tokens[1]))
+        # A hit makes tokens[0] the most recently used
+        asyncio.run(main.get_current_user(tokens[0]))
+        asyncio.run(main.get_current_user(tokens[2]))
+
+    assert list(token_cache) == [tokens[0], tokens[2]]
+
+
+@pytest.mark.parametrize("token", [
+    "not-a-token",
+    jwt.encode({"sub": "testuser"}, main.SECRET_KEY, algorithm=main.ALGORITHM),
+    jwt.encode({"sub": "testuser", "user_id": "1"}, "wrong-key", algorithm=main.ALGORITHM),
+])
+def test_token_cache_skips_invalid_tokens(token_cache, token):
+    """Test tokens that fail verification are never cached."""
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(main.get_current_user(token))
+
+    assert exc_info.value.status_code == 401
+    assert token not in token_cache
+
@@ -1,11 +1,14 @@
 from flask import Flask, request, jsonify
 import subprocess
+import selectors
 import os
 import json
 import uuid
 import time
 import threading
+import queue
 import requests
+from requests.adapters import HTTPAdapter
 import logging
 from datetime import datetime
 from dotenv import load_dotenv
@@ -28,6 +31,21 @@ JWT_SECRET = os.getenv('JWT_SECRET', 'default_secret_key')
 ALLOWED_COMMANDS_PATH = os.getenv('ALLOWED_COMMANDS_PATH', 'allowed_commands.json')
 MAX_EXECUTION_TIME = int(os.getenv('MAX_EXECUTION_TIME', '3600'))  # 1 hour in seconds
 EXECUTION_DIR = os.getenv('EXECUTION_DIR', '/tmp/executions')
+READ_CHUNK_SIZE = 65536  # Max bytes taken from a pipe per read
+SELECT_TIMEOUT = 0.5  # Seconds between timeout checks while output is idle
+STATUS_PUSH_INTERVAL = 0.2  # Min seconds between running status updates
+
+# Keep-alive connections to the socket service, shared by execution threads
+STATUS_UPDATE_TIMEOUT = 5  # Seconds to wait on the socket service
+socket_session = requests.Session()
+socket_session.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0))
+socket_session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0))
+
+# Status updates waiting to be sent, drained by a single sender thread
+STATUS_QUEUE_SIZE = 1024
+status_queue = queue.Queue(maxsize=STATUS_QUEUE_SIZE)
+status_sender = None
+status_sender_lock = threading.Lock()
 
 # Create execution directory if it doesn't exist
 os.makedirs(EXECUTION_DIR, exist_ok=True)
@@ -56,6 +74,11 @@ def load_allowed_commands():
 
 allowed_commands_config = load_allowed_commands()
 
+# Lookup structures for is_command_allowed, built once from the config
+ALLOWED_BASE_COMMANDS = frozenset(allowed_commands_config.get('commands', []))
+ALLOWED_PATH_PREFIXES = tuple(allowed_commands_config.get('paths', []))
+PATH_ARGUMENT_PREFIXES = ('/', './', '../')
+
 # Authentication decorator
 def token_required(f):
     @wraps(f)
@@ -129,22 +152,28 @@ def is_command_allowed(command):
     base_command = parts[0]
     
     # Check if the base command is in the allowed list
-    if base_command not in allowed_commands_config.get('commands', []):
+    if base_command not in ALLOWED_BASE_COMMANDS:
         return False
     
     # Check if command tries to access disallowed paths
     for part in parts[1:]:
-        if part.startswith('/') or part.startswith('./') or part.startswith('../'):
-            path_allowed = False
-            for allowed_path in allowed_commands_config.get('paths', []):
-                if part.startswith(allowed_path):
-                    path_allowed = True
-                    break
-            if not path_allowed:
-                return False
+        if part.startswith(PATH_ARGUMENT_PREFIXES) and not part.startswith(ALLOWED_PATH_PREFIXES):
+            return False
     
     return True
 
+# Last non-empty lines of raw output, decoding only the tail
+def last_lines(data, count):
+    size = 4096
+    while True:
+        # The first line of a partial window may be cut, so it only counts
+        # once the window covers all of the data
+        text = data[-size:].decode('utf-8', errors='replace')
+        lines = [line for line in text.splitlines() if line]
+        if len(lines) > count or size >= len(data):
+            return '\n'.join(lines[-count:])
+        size *= 4
+
 # Execute command in a separate thread
 def execute_command_task(execution_id, command, user_id):
     try:
@@ -168,7 +197,7 @@ def execute_command_task(execution_id, command, user_id):
             shell=True,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            text=True,
+            bufsize=READ_CHUNK_SIZE,
             cwd=execution_path
         )
         
@@ -179,74 +208,105 @@ def execute_command_task(execution_id, command, user_id):
             'user_id': user_id
         }
         
-        # Poll process and update status
-        output_lines = []
-        error_lines = []
+        # Read whatever each pipe has ready as soon as it arrives, draining
+        # stdout and stderr together so neither pipe can fill up and stall;
+        # output stays raw bytes and is only decoded where it is sent
+        stdout_data = bytearray()
+        stderr_data = bytearray()
+        selector = selectors.DefaultSelector()
+        selector.register(process.stdout, selectors.EVENT_READ, stdout_data)
+        selector.register(process.stderr, selectors.EVENT_READ, stderr_data)
+        line_count = 0
+        output_pending = False
+        last_push = 0.0
+        timed_out = False
         
-        while True:
-            # Check if process has timed out
-            if time.time() - start_time > MAX_EXECUTION_TIME:
-                process.kill()
-                update_execution_status(
-                    execution_id, 
-                    'failed', 
-                    100, 
-                    '\n'.join(output_lines), 
-                    "Execution timed out"
-                )
-                break
-            
-            # Check if process has completed
-            return_code = process.poll()
-            if return_code is not None:
-                # Process has completed
-                stdout, stderr = process.communicate()
-                
-                # Store output
-                output_lines.extend([line for line in stdout.split('\n') if line])
-                error_lines.extend([line for line in stderr.split('\n') if line])
-                
-                with open(output_file, 'w') as f:
-                    f.write(stdout)
+        try:
+            while selector.get_map():
+                # Check if process has timed out
+                if time.time() - start_time > MAX_EXECUTION_TIME:
+                    process.kill()
+                    timed_out = True
+                    break
                 
-                with open(error_file, 'w') as f:
-                    f.write(stderr)
+                for key, _ in selector.select(timeout=SELECT_TIMEOUT):
+                    chunk = key.fileobj.read1(READ_CHUNK_SIZE)
+                    if not chunk:
+                        # Pipe closed
+                        selector.unregister(key.fileobj)
+                        continue
+                    key.data.extend(chunk)
+                    
+                    if key.data is stdout_data:
+                        line_count += chunk.count(b'\n')
+                        output_pending = True
                 
-                # Update status
-                if return_code == 0:
+                # Update status with progress at most once per push interval;
+                # the final status always carries the full output
+                if output_pending and time.monotonic() - last_push >= STATUS_PUSH_INTERVAL:
+                    progress = min(99, int(line_count / 10))  # Simple progress estimation
                     update_execution_status(
                         execution_id, 
-                        'completed', 
-                        100, 
-                        '\n'.join(output_lines), 
+                        'running', 
+                        progress, 
+                        last_lines(stdout_data, 10),
                         None
                     )
-                else:
-                    update_execution_status(
-                        execution_id, 
-                        'failed', 
-                        100, 
-                        '\n'.join(output_lines), 
-                        '\n'.join(error_lines)
-                    )
-                break
+                    output_pending = False
+                    last_push = time.monotonic()
+        finally:
+            selector.close()
+        
+        # Both pipes are closed, but the process may still be running with
+        # its output redirected; wait for the exit status within the limit
+        if not timed_out:
+            try:
+                return_code = process.wait(
+                    timeout=max(0, MAX_EXECUTION_TIME - (time.time() - start_time))
+                )
+            except subprocess.TimeoutExpired:
+                process.kill()
+                timed_out = True
+        
+        stdout = stdout_data.decode('utf-8', errors='replace')
+        stderr = stderr_data.decode('utf-8', errors='replace')
+        output_lines = [line for line in stdout.splitlines() if line]
+        error_lines = [line for line in stderr.splitlines() if line]
+        
+        if timed_out:
+            process.wait()
+            update_execution_status(
+                execution_id, 
+                'failed', 
+                100, 
+                '\n'.join(output_lines), 
+                "Execution timed out"
+            )
+        else:
+            # Store output
+            with open(output_file, 'wb') as f:
+                f.write(stdout_data)
+            
+            with open(error_file, 'wb') as f:
+                f.write(stderr_data)
             
-            # Process is still running, read output
-            stdout_line = process.stdout.readline().strip()
-            if stdout_line:
-                output_lines.append(stdout_line)
-                # Update status with progress
-                progress = min(99, int(len(output_lines) / 10))  # Simple progress estimation
+            # Update status
+            if return_code == 0:
                 update_execution_status(
                     execution_id, 
-                    'running', 
-                    progress, 
-                    '\n'.join(output_lines[-10:]),  # Last 10 lines
+                    'completed', 
+                    100, 
+                    '\n'.join(output_lines), 
                     None
                 )
-            
-            # Small delay to prevent high CPU usage
-            time.sleep(0.1)
+            else:
+                update_execution_status(
+                    execution_id, 
+                    'failed', 
+                    100, 
+                    '\n'.join(output_lines), 
+                    '\n'.join(error_lines)
+                )
         
         # Clean up
         if execution_id in active_executions:
@@ -258,7 +318,7 @@ def execute_command_task(execution_id, command, user_id):
         if execution_id in active_executions:
             del active_executions[execution_id]
 
-# Update execution status and notify socket service
+# Update execution status and queue it for the socket service
 def update_execution_status(execution_id, status, progress, output, error):
     try:
         data = {
@@ -273,13 +333,45 @@ def update_execution_status(execution_id, status, progress, output, error):
         if error:
             data['error'] = error
         
-        # Send update to socket service
-        response = requests.post(f"{SOCKET_SERVICE_URL}/api/execution-status", json=data)
-        if response.status_code != 200:
-            logger.error(f"Failed to update socket service: {response.text}")
+        # Hand the update to the sender thread instead of blocking on HTTP
+        start_status_sender()
+        if status == 'running':
+            # Progress updates are superseded by the next one, so drop
+            # them rather than stall the execution when the queue is full
+            try:
+                status_queue.put_nowait(data)
+            except queue.Full:
+                logger.warning(f"Status queue full, dropping progress update for {execution_id}")
+        else:
+            status_queue.put(data)
     except Exception as e:
         logger.error(f"Error updating status: {str(e)}")
 
+# Send queued status updates to the socket service, in order
+def send_status_updates():
+    while True:
+        data = status_queue.get()
+        try:
+            response = socket_session.post(
+                f"{SOCKET_SERVICE_URL}/api/execution-status",
+                json=data,
+                timeout=STATUS_UPDATE_TIMEOUT
+            )
+            if response.status_code != 200:
+                logger.error(f"Failed to update socket service: {response.text}")
+        except Exception as e:
+            logger.error(f"Error updating status: {str(e)}")
+
+# Start the sender thread in this process if it isn't running
+def start_status_sender():
+    global status_sender
+    if status_sender is not None and status_sender.is_alive():
+        return
+    with status_sender_lock:
+        if status_sender is None or not status_sender.is_alive():
+            status_sender = threading.Thread(target=send_status_updates, daemon=True)
+            status_sender.start()
+
 # API Routes
 @app.route('/health', methods=['GET'])
 def health_check():
@@ -349,12 +441,12 @@ def get_execution_status(execution_id):
         error = ""
         
         if os.path.exists(output_file):
-            with open(output_file, 'r') as f:
-                output = f.read()
+            with open(output_file, 'rb') as f:
+                output = f.read().decode('utf-8', errors='replace')
         
         if os.path.exists(error_file):
-            with open(error_file, 'r') as f:
-                error = f.read()
+            with open(error_file, 'rb') as f:
+                error = f.read().decode('utf-8', errors='replace')
         
         return jsonify({
             'executionId': execution_id,
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Command Allow-List Test
+
+This script tests is_command_allowed against a fixed allow-list, without
+a running service.
+
+Usage:
+    python -m unittest tests.test_command_allowed
+"""
+
+import unittest
+from unittest import mock
+
+import app
+
+
+class CommandAllowedTest(unittest.TestCase):
+    """Test case for is_command_allowed"""
+
+    def setUp(self):
+        """Use a known allow-list instead of the configured one"""
+        patchers = [
+            mock.patch.object(app, 'ALLOWED_BASE_COMMANDS', frozenset({'ls', 'echo', 'cat'})),
+            mock.patch.object(app, 'ALLOWED_PATH_PREFIXES', ('/tmp', '/home')),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_allowed_commands(self):
+        """Test allowed commands with and without arguments"""
+        self.assertTrue(app.is_command_allowed('ls'))
+        self.assertTrue(app.is_command_allowed('ls -la'))
+        self.assertTrue(app.is_command_allowed('echo hello world'))
+        self.assertTrue(app.is_command_allowed('  echo   padded  '))
+
+    def test_allowed_paths(self):
+        """Test path arguments under an allowed prefix"""
+        self.assertTrue(app.is_command_allowed('ls /tmp'))
+        self.assertTrue(app.is_command_allowed('cat /home/user/notes.txt'))
+        self.assertTrue(app.is_command_allowed('ls -la /tmp/work /home'))
+
+    def test_denied_commands(self):
+        """Test commands missing from the allow-list"""
+        self.assertFalse(app.is_command_allowed('rm -rf /tmp/work'))
+        self.assertFalse(app.is_command_allowed('sudo ls'))
+        # Only whole command names match
+        self.assertFalse(app.is_command_allowed('lsblk'))
+        self.assertFalse(app.is_command_allowed('LS'))
+
+    def test_denied_paths(self):
+        """Test path arguments outside the allowed prefixes"""
+        self.assertFalse(app.is_command_allowed('cat /etc/passwd'))
+        self.assertFalse(app.is_command_allowed('ls /tmp /etc'))
+        self.assertFalse(app.is_command_allowed('cat ./secrets'))
+        self.assertFalse(app.is_command_allowed('cat ../secrets'))
+
+    def test_path_qualified_binary(self):
+        """Test a binary named by path must itself be on the allow-list"""
+        self.assertFalse(app.is_command_allowed('/bin/ls'))
+        self.assertFalse(app.is_command_allowed('/tmp/ls /tmp'))
+        self.assertFalse(app.is_command_allowed('./ls'))
+
+    def test_empty_command(self):
+        """Test empty and whitespace-only commands"""
+        self.assertFalse(app.is_command_allowed(''))
+        self.assertFalse(app.is_command_allowed('   '))
+        self.assertFalse(app.is_command_allowed('\n\t'))
+
+
+if __name__ == "__main__":
+    unittest.main()
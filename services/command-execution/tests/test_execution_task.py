@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Command Execution Output Reader Test
+
+This script tests how execute_command_task reads command output and how
+last_lines picks the lines sent with running status updates. Commands run
+in a local shell; status updates are captured instead of being sent.
+
+Usage:
+    python -m unittest tests.test_execution_task
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import app
+
+
+class LastLinesTest(unittest.TestCase):
+    """Test case for last_lines"""
+
+    def test_empty_data(self):
+        """Test empty output gives no lines"""
+        self.assertEqual(app.last_lines(b'', 10), '')
+        self.assertEqual(app.last_lines(bytearray(), 10), '')
+
+    def test_last_lines_skip_blank_lines(self):
+        """Test only the last non-empty lines are returned"""
+        data = b'one\n\ntwo\nthree\n\n'
+        self.assertEqual(app.last_lines(data, 2), 'two\nthree')
+        self.assertEqual(app.last_lines(data, 10), 'one\ntwo\nthree')
+
+    def test_crlf_data(self):
+        """Test CRLF line endings are not kept in the lines"""
+        data = b'one\r\ntwo\r\nthree\r\n'
+        self.assertEqual(app.last_lines(data, 2), 'two\nthree')
+
+    def test_trailing_partial_line(self):
+        """Test a last line without a newline is included"""
+        self.assertEqual(app.last_lines(b'one\ntwo', 1), 'two')
+
+    def test_output_larger_than_window(self):
+        """Test lines are counted correctly past the first decode window"""
+        data = b''.join(b'line %d\n' % i for i in range(5000))
+        self.assertEqual(app.last_lines(data, 3), 'line 4997\nline 4998\nline 4999')
+
+        # Few lines longer than the window must not lose the cut first line
+        data = b'a' * 10000 + b'\n' + b'b' * 10000
+        self.assertEqual(app.last_lines(data, 2), 'a' * 10000 + '\n' + 'b' * 10000)
+
+
+class ExecuteCommandTaskTest(unittest.TestCase):
+    """Test case for the output reader in execute_command_task"""
+
+    def setUp(self):
+        """Run executions in a temporary directory and capture status updates"""
+        self.execution_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.execution_dir, ignore_errors=True)
+
+        patcher = mock.patch.object(app, 'EXECUTION_DIR', self.execution_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = mock.patch.object(app, 'update_execution_status')
+        self.update_status = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_command(self, command):
+        """Run a command to completion and return its final status update"""
+        app.execute_command_task('test-execution', command, 'test-user')
+        self.assertNotIn('test-execution', app.active_executions)
+        return self.update_status.call_args_list[-1][0]
+
+    def read_file(self, name):
+        """Read an output file of the test execution"""
+        with open(os.path.join(self.execution_dir, 'test-execution', name), 'rb') as f:
+            return f.read()
+
+    def test_interleaved_stdout_and_stderr(self):
+        """Test output written to both pipes in turn is kept apart"""
+        _, status, progress, output, error = self.run_command(
+            'for i in 1 2 3; do echo out$i; echo err$i >&2; sleep 0.05; done; exit 1'
+        )
+
+        self.assertEqual(status, 'failed')
+        self.assertEqual(progress, 100)
+        self.assertEqual(output, 'out1\nout2\nout3')
+        self.assertEqual(error, 'err1\nerr2\nerr3')
+        self.assertEqual(self.read_file('output.txt'), b'out1\nout2\nout3\n')
+        self.assertEqual(self.read_file('error.txt'), b'err1\nerr2\nerr3\n')
+
+    def test_large_stderr_does_not_stall_stdout(self):
+        """Test a full stderr pipe is drained while stdout is still open"""
+        _, status, _, output, _ = self.run_command(
+            "head -c 200000 /dev/zero | tr '\\0' e >&2; echo done"
+        )
+
+        self.assertEqual(status, 'completed')
+        self.assertEqual(output, 'done')
+        self.assertEqual(len(self.read_file('error.txt')), 200000)
+
+    def test_stderr_closed_before_stdout(self):
+        """Test reading continues after one pipe reaches EOF"""
+        _, status, _, output, error = self.run_command(
+            'exec 2>&-; sleep 0.2; echo first; sleep 0.2; echo second'
+        )
+
+        self.assertEqual(status, 'completed')
+        self.assertEqual(output, 'first\nsecond')
+        self.assertIsNone(error)
+        self.assertEqual(self.read_file('error.txt'), b'')
+
+    def test_stdout_closed_before_stderr(self):
+        """Test stderr is still read after stdout reaches EOF"""
+        _, status, _, output, error = self.run_command(
+            'exec 1>&-; sleep 0.2; echo late >&2; exit 2'
+        )
+
+        self.assertEqual(status, 'failed')
+        self.assertEqual(output, '')
+        self.assertEqual(error, 'late')
+
+    def test_trailing_partial_line(self):
+        """Test output that does not end in a newline is kept whole"""
+        _, status, _, output, _ = self.run_command("printf 'one\\ntwo'")
+
+        self.assertEqual(status, 'completed')
+        self.assertEqual(output, 'one\ntwo')
+        self.assertEqual(self.read_file('output.txt'), b'one\ntwo')
+
+    def test_crlf_output(self):
+        """Test CRLF line endings are not kept in the status output"""
+        _, status, _, output, error = self.run_command(
+            "printf 'one\\r\\ntwo\\r\\n'; printf 'bad\\r\\n' >&2; exit 1"
+        )
+
+        self.assertEqual(status, 'failed')
+        self.assertEqual(output, 'one\ntwo')
+        self.assertEqual(error, 'bad')
+        self.assertEqual(self.read_file('output.txt'), b'one\r\ntwo\r\n')
+
+    def test_timeout_while_output_flows(self):
+        """Test a command still writing output is killed at the time limit"""
+        with mock.patch.object(app, 'MAX_EXECUTION_TIME', 1):
+            start = time.monotonic()
+            _, status, _, output, error = self.run_command(
+                'while true; do echo tick; sleep 0.1; done'
+            )
+
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertEqual(status, 'failed')
+        self.assertEqual(error, 'Execution timed out')
+        self.assertIn('tick', output)
+
+    def test_timeout_after_pipes_close(self):
+        """Test a command that closes its pipes and keeps running is killed"""
+        with mock.patch.object(app, 'MAX_EXECUTION_TIME', 1):
+            start = time.monotonic()
+            _, status, _, _, error = self.run_command('exec >/dev/null 2>&1; sleep 6')
+
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertEqual(status, 'failed')
+        self.assertEqual(error, 'Execution timed out')
+
+    def test_running_updates_carry_last_lines(self):
+        """Test running updates send the latest output lines"""
+        self.run_command('echo one; sleep 0.3; echo two')
+
+        running = [
+            call[0] for call in self.update_status.call_args_list
+            if call[0][1] == 'running' and call[0][3] != 'Starting execution...'
+        ]
+        self.assertTrue(running)
+        self.assertEqual(running[-1][3], 'one\ntwo')
+
+
+if __name__ == "__main__":
+    unittest.main()
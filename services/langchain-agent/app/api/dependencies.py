@@ -11,7 +11,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.infrastructure.persistence.database import get_session
-from app.infrastructure.adapters.command_client import CommandClient
+from app.infrastructure.adapters.command_client import (
+    CommandClient,
+    get_command_client as get_shared_command_client,
+)
 from app.core.services.agent_service import AgentService
 from app.infrastructure.persistence.repositories import SQLAgentRepository, SQLExecutionRepository
 from app.core.agents.factory import AgentFactory
@@ -73,9 +76,9 @@ def get_command_client() -> CommandClient:
     Get command client dependency.
     
     Returns:
-        CommandClient instance
+        Shared CommandClient instance
     """
-    return CommandClient(base_url=settings.COMMAND_SERVICE_URL)
+    return get_shared_command_client()
 
 
 async def get_agent_service(
@@ -25,6 +25,9 @@ from app.core.entities.agent import AgentType
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Valid agent type values, for filtering without raising on unknown types
+_AGENT_TYPE_VALUES = frozenset(agent_type.value for agent_type in AgentType)
+
 # Create router
 router = APIRouter(
     prefix="/agents", 
@@ -54,8 +57,8 @@ async def create_agent(
     """
     try:
         # Convert Pydantic models to dicts
-        configuration = agent_data.configuration.dict() if agent_data.configuration else None
-        permissions = agent_data.permissions.dict() if agent_data.permissions else None
+        configuration = agent_data.configuration.model_dump() if agent_data.configuration else None
+        permissions = agent_data.permissions.model_dump() if agent_data.permissions else None
         
         # Create agent
         agent = await agent_service.create_agent(
@@ -108,11 +111,10 @@ async def list_agents(
         # Convert agent_type to enum if provided
         agent_type_enum = None
         if agent_type:
-            try:
-                agent_type_enum = AgentType(agent_type)
-            except ValueError:
+            if agent_type not in _AGENT_TYPE_VALUES:
                 # Invalid agent type, return empty list
                 return AgentList(items=[], total=0, skip=offset, limit=limit)
+            agent_type_enum = AgentType(agent_type)
         
         # Get agents
         agents, total = await agent_service.agent_repository.list(
@@ -206,8 +208,8 @@ async def update_agent(
     """
     try:
         # Convert Pydantic models to dicts
-        configuration = agent_data.configuration.dict() if agent_data.configuration else None
-        permissions = agent_data.permissions.dict() if agent_data.permissions else None
+        configuration = agent_data.configuration.model_dump() if agent_data.configuration else None
+        permissions = agent_data.permissions.model_dump() if agent_data.permissions else None
         
         # Update agent
         agent = await agent_service.update_agent(
@@ -392,7 +394,9 @@ async def _stream_execution(
     try:
         async for update in agent_service.stream_execution(execution_id, user_id):
             # Prepare the SSE data
-            if isinstance(update, dict):
+            if isinstance(update, str):
+                data = update
+            elif isinstance(update, dict):
                 data = json.dumps(update)
             else:
                 data = json.dumps({"type": "content", "content": str(update)})
@@ -5,6 +5,7 @@ This module provides REST API endpoints for execution management.
 """
 
 import logging
+from enum import Enum
 from typing import Optional
 from fastapi import APIRouter, HTTPException, status, Depends, Query
 
@@ -59,22 +60,15 @@ async def list_executions(
                 # Invalid status, return empty list
                 return ExecutionList(items=[], total=0, skip=skip, limit=limit)
         
-        # Get executions
-        executions = await agent_service.list_executions(
+        # Get executions with the total count in one query
+        executions, total = await agent_service.list_executions(
             user_id=user_id,
             agent_id=agent_id,
             status=status,
-            skip=skip,
+            offset=skip,
             limit=limit
         )
         
-        # Get total count
-        total = await agent_service.count_executions(
-            user_id=user_id,
-            agent_id=agent_id,
-            status=status
-        )
-        
         return ExecutionList(
             items=executions,
             total=total,
@@ -159,7 +153,7 @@ async def get_execution_status(
         # Return a subset of the execution data for status
         return ExecutionStatusResponse(
             id=execution.id,
-            status=execution.status.value if hasattr(execution.status, "value") else execution.status,
+            status=execution.status.value if isinstance(execution.status, Enum) else execution.status,
             output=execution.output,
             error=execution.error,
             tokens_used=execution.tokens_used,
@@ -207,7 +201,7 @@ async def cancel_execution(
         # Return a subset of the execution data for status
         return ExecutionStatusResponse(
             id=execution.id,
-            status=execution.status.value if hasattr(execution.status, "value") else execution.status,
+            status=execution.status.value if isinstance(execution.status, Enum) else execution.status,
             output=execution.output,
             error=execution.error,
             tokens_used=execution.tokens_used,
@@ -7,7 +7,8 @@ This module provides WebSocket endpoints for real-time agent interaction.
 import logging
 import json
 import asyncio
-from typing import Dict, Any, Optional
+from enum import Enum
+from typing import Dict, Any, Optional, Set, Union
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, Query, status
 from uuid import UUID
 
@@ -35,6 +36,7 @@ class ConnectionManager:
         """Initialize the connection manager."""
         self.active_connections: Dict[str, WebSocket] = {}
         self.execution_connections: Dict[str, str] = {}  # execution_id -> connection_id
+        self.connection_executions: Dict[str, Set[str]] = {}  # connection_id -> execution_ids
     
     async def connect(self, connection_id: str, websocket: WebSocket) -> None:
         """
@@ -59,30 +61,25 @@ class ConnectionManager:
             self.active_connections.pop(connection_id)
             
             # Clean up execution connections
-            to_remove = []
-            for execution_id, conn_id in self.execution_connections.items():
-                if conn_id == connection_id:
-                    to_remove.append(execution_id)
-            
-            for execution_id in to_remove:
-                self.execution_connections.pop(execution_id)
+            for execution_id in self.connection_executions.pop(connection_id, ()):
+                self.execution_connections.pop(execution_id, None)
             
             logger.info(f"WebSocket disconnected: {connection_id}")
     
-    async def send_message(self, connection_id: str, message: Dict[str, Any]) -> bool:
+    async def send_message(self, connection_id: str, message: Union[Dict[str, Any], str]) -> bool:
         """
         Send a message to a specific connection.
         
         Args:
             connection_id: Connection ID
-            message: Message to send
+            message: Message to send, or an already serialized JSON string
             
         Returns:
             True if message was sent, False otherwise
         """
         if connection_id in self.active_connections:
             websocket = self.active_connections[connection_id]
-            await websocket.send_text(json.dumps(message))
+            await websocket.send_text(message if isinstance(message, str) else json.dumps(message))
             return True
         return False
     
@@ -95,6 +92,7 @@ class ConnectionManager:
             connection_id: Connection ID
         """
         self.execution_connections[execution_id] = connection_id
+        self.connection_executions.setdefault(connection_id, set()).add(execution_id)
         logger.info(f"Registered execution {execution_id} with connection {connection_id}")
     
     def get_connection_for_execution(self, execution_id: str) -> Optional[str]:
@@ -108,6 +106,23 @@ class ConnectionManager:
             Connection ID if found, None otherwise
         """
         return self.execution_connections.get(execution_id)
+    
+    def unregister_execution(self, execution_id: str) -> None:
+        """
+        Unregister an execution from its connection.
+        
+        Args:
+            execution_id: Execution ID
+        """
+        connection_id = self.execution_connections.pop(execution_id, None)
+        if connection_id is None:
+            return
+        
+        executions = self.connection_executions.get(connection_id)
+        if executions is not None:
+            executions.discard(execution_id)
+            if not executions:
+                self.connection_executions.pop(connection_id)
 
 
 # Create connection manager
@@ -244,7 +259,7 @@ async def handle_execute_message(
                 "type": "execution_started",
                 "execution_id": str(execution.id),
                 "agent_id": agent_id,
-                "status": execution.status.value if hasattr(execution.status, "value") else execution.status,
+                "status": execution.status.value if isinstance(execution.status, Enum) else execution.status,
             }
         )
         
@@ -354,5 +369,4 @@ async def stream_execution_updates(
     
     finally:
         # Clean up execution connection
-        if execution_id in manager.execution_connections:
-            manager.execution_connections.pop(execution_id) 
\ No newline at end of file
+        manager.unregister_execution(execution_id) 
\ No newline at end of file
@@ -2,11 +2,15 @@
 Agents package.
 
 This package provides agent implementations for executing tasks.
+
+ConversationalAgent pulls in LangChain when imported, so it is loaded on
+first attribute access rather than when the package is imported.
 """
 
+from typing import Any
+
 from app.core.agents.base_agent import BaseAgent, AgentCallback
 from app.core.agents.agent_result import AgentResult
-from app.core.agents.conversational_agent import ConversationalAgent
 from app.core.agents.command_agent import CommandAgent
 from app.core.agents.factory import AgentFactory
 
@@ -17,4 +21,12 @@ __all__ = [
     "ConversationalAgent",
     "CommandAgent",
     "AgentFactory",
-] 
\ No newline at end of file
+]
+
+
+def __getattr__(name: str) -> Any:
+    """Lazily import agent classes on first access."""
+    if name == "ConversationalAgent":
+        from app.core.agents.conversational_agent import ConversationalAgent
+        return ConversationalAgent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -96,6 +96,9 @@ class BaseAgent(ABC):
         self.system_message = configuration.system_message
         self.streaming = configuration.streaming
         self.max_iterations = configuration.max_iterations
+        
+        # Allowed command prefixes, checked in a single startswith call
+        self._allowed_command_prefixes = tuple(permissions.allowed_commands or ())
     
     @abstractmethod
     async def run(
@@ -133,7 +136,8 @@ class BaseAgent(ABC):
         """
         if callback:
             await callback.on_step(step_type, content, metadata)
-        logger.debug(f"Agent step: {step_type} - {content}")
+        # Lazy %-formatting: step content can be large and debug is usually off
+        logger.debug("Agent step: %s - %s", step_type, content)
     
     async def _handle_command(
         self,
@@ -169,7 +173,7 @@ class BaseAgent(ABC):
                 duration_ms=duration_ms,
                 metadata=metadata
             )
-        logger.debug(f"Agent command: {command} - Status: {status}")
+        logger.debug("Agent command: %s - Status: %s", command, status)
     
     def _can_execute_command(self, command: str) -> bool:
         """
@@ -185,14 +189,10 @@ class BaseAgent(ABC):
             return False
         
         # If allowed_commands is empty, all commands are allowed
-        if not self.permissions.allowed_commands:
+        if not self._allowed_command_prefixes:
             return True
         
-        # Check if the command is in the list of allowed commands
+        # Check if the command starts with any of the allowed commands
         # This is a simple check, a more robust implementation would parse
         # the command and check if it matches allowed patterns
-        for allowed_command in self.permissions.allowed_commands:
-            if command.startswith(allowed_command):
-                return True
-        
-        return False 
\ No newline at end of file
+        return command.startswith(self._allowed_command_prefixes) 
\ No newline at end of file
@@ -6,7 +6,7 @@ This module provides a conversational agent implementation using LangChain.
 
 import logging
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 from langchain_openai import ChatOpenAI
 from langchain.agents import AgentExecutor, create_openai_tools_agent
@@ -14,11 +14,12 @@ from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain.schema import AgentAction, AgentFinish, AIMessage, HumanMessage
 from langchain.schema.runnable import RunnableConfig
 from langchain.callbacks.base import BaseCallbackHandler
-from langchain.tools.base import BaseTool
 
 from app.core.agents.base_agent import BaseAgent, AgentCallback
 from app.core.agents.agent_result import AgentResult
-from app.core.tools.command_tool import CommandTool
+
+if TYPE_CHECKING:
+    from langchain.tools.base import BaseTool
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -170,6 +171,11 @@ class ConversationalAgent(BaseAgent):
     This agent uses LangChain and LLMs to have conversations and perform actions.
     """
     
+    def __init__(self, *args: Any, **kwargs: Any):
+        """Initialize the agent; the LangChain executor is built on first run."""
+        super().__init__(*args, **kwargs)
+        self._agent_executor: Optional[AgentExecutor] = None
+    
     async def run(
         self,
         input: str,
@@ -189,42 +195,8 @@ class ConversationalAgent(BaseAgent):
         start_time = time.time()
         
         try:
-            # Set up tools
-            tools = self._create_tools()
-            
-            # Create LLM
-            llm = ChatOpenAI(
-                model=self.model_name,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-                streaming=self.streaming
-            )
-            
-            # Create system message
-            system_message = self.system_message or (
-                "You are a helpful AI assistant that can have conversations and execute commands. "
-                "When a user asks you to perform an action, use the appropriate tool."
-            )
-            
-            # Create prompt
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", system_message),
-                MessagesPlaceholder(variable_name="chat_history"),
-                ("human", "{input}"),
-                MessagesPlaceholder(variable_name="agent_scratchpad"),
-            ])
-            
-            # Create agent
-            agent = create_openai_tools_agent(llm, tools, prompt)
-            
-            # Create agent executor
-            agent_executor = AgentExecutor(
-                agent=agent,
-                tools=tools,
-                verbose=True,
-                max_iterations=self.max_iterations,
-                handle_parsing_errors=True,
-            )
+            # Reuse the executor across runs; callbacks are passed per call
+            agent_executor = self._get_agent_executor()
             
             # Create callback handler
             handler = AgentCallbackHandler(callback)
@@ -272,7 +244,60 @@ class ConversationalAgent(BaseAgent):
                 }
             )
     
-    def _create_tools(self) -> List[BaseTool]:
+    def _get_agent_executor(self) -> AgentExecutor:
+        """
+        Get the LangChain agent executor, building it on first use.
+        
+        The executor holds no per-run state, so it is shared by every run
+        of this agent instance.
+        
+        Returns:
+            Agent executor
+        """
+        if self._agent_executor is not None:
+            return self._agent_executor
+        
+        # Set up tools
+        tools = self._create_tools()
+        
+        # Create LLM
+        llm = ChatOpenAI(
+            model=self.model_name,
+            temperature=self.temperature,
+            max_tokens=self.max_tokens,
+            streaming=self.streaming
+        )
+        
+        # Create system message
+        system_message = self.system_message or (
+            "You are a helpful AI assistant that can have conversations and execute commands. "
+            "When a user asks you to perform an action, use the appropriate tool."
+        )
+        
+        # Create prompt
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", system_message),
+            MessagesPlaceholder(variable_name="chat_history"),
+            ("human", "{input}"),
+            MessagesPlaceholder(variable_name="agent_scratchpad"),
+        ])
+        
+        # Create agent
+        agent = create_openai_tools_agent(llm, tools, prompt)
+        
+        # Create agent executor
+        agent_executor = AgentExecutor(
+            agent=agent,
+            tools=tools,
+            verbose=True,
+            max_iterations=self.max_iterations,
+            handle_parsing_errors=True,
+        )
+        
+        self._agent_executor = agent_executor
+        return agent_executor
+    
+    def _create_tools(self) -> List["BaseTool"]:
         """
         Create tools for the agent.
         
@@ -283,6 +308,9 @@ class ConversationalAgent(BaseAgent):
         
         # Add command tool if allowed
         if self.permissions.execute_commands:
+            # Imported here so agents without command access never load the tool
+            from app.core.tools.command_tool import CommandTool
+            
             command_tool = CommandTool(
                 command_client=self.command_client,
                 allowed_commands=self.permissions.allowed_commands,
@@ -5,10 +5,9 @@ This module provides the agent factory for creating instances of different agent
 """
 
 import logging
-from typing import Dict, List, Optional, Type, Any
+from typing import Callable, Dict, List, Optional, Type, Any
 
 from app.core.agents.base_agent import BaseAgent
-from app.core.agents.conversational_agent import ConversationalAgent
 from app.core.agents.command_agent import CommandAgent
 from app.infrastructure.adapters.command_client import CommandClient
 from app.core.domain.entities import AgentPermissions
@@ -16,6 +15,21 @@ from app.core.domain.entities import AgentPermissions
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Permissions used when none are given; agents only read their permissions,
+# so a single shared instance is safe
+_DEFAULT_PERMISSIONS = AgentPermissions()
+
+
+def _load_conversational_agent() -> Type[BaseAgent]:
+    """Import ConversationalAgent, and with it LangChain, on first use."""
+    from app.core.agents.conversational_agent import ConversationalAgent
+    return ConversationalAgent
+
+
+def _load_command_agent() -> Type[BaseAgent]:
+    """Return CommandAgent, which needs no LangChain."""
+    return CommandAgent
+
 
 class AgentFactory:
     """
@@ -32,14 +46,15 @@ class AgentFactory:
             command_client: Command client for executing commands
         """
         self.command_client = command_client
-        self.agent_types: Dict[str, Type[BaseAgent]] = {}
+        # Agent type name -> loader returning the agent class
+        self.agent_types: Dict[str, Callable[[], Type[BaseAgent]]] = {}
         self._register_agent_types()
     
     def _register_agent_types(self):
         """Register available agent types."""
         self.agent_types = {
-            "conversational": ConversationalAgent,
-            "command": CommandAgent,
+            "conversational": _load_conversational_agent,
+            "command": _load_command_agent,
         }
     
     def get_available_agent_types(self) -> List[str]:
@@ -77,16 +92,10 @@ class AgentFactory:
         
         # Create default permissions if none provided
         if not permissions:
-            permissions = AgentPermissions(
-                execute_commands=False,
-                allowed_commands=[],
-                allowed_paths=[],
-                memory_limit=None,
-                network_access=False
-            )
+            permissions = _DEFAULT_PERMISSIONS
         
         # Create agent instance
-        agent_class = self.agent_types[agent_type]
+        agent_class = self.agent_types[agent_type]()
         
         try:
             agent = agent_class(
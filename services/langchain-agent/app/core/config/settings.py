@@ -44,9 +44,11 @@ class Settings(BaseSettings):
     DB_PASSWORD: str = "postgres"
     DB_ECHO_LOG: bool = False
     DB_POOL_SIZE: int = 5
+    DB_POOL_WARM_SIZE: int = 2
     DB_MAX_OVERFLOW: int = 10
     DB_POOL_TIMEOUT: int = 30
     DB_POOL_RECYCLE: int = 1800
+    DB_STATEMENT_CACHE_SIZE: int = 1024
     DB_CREATE_TABLES: bool = True
     
     # LangChain settings
@@ -56,6 +58,7 @@ class Settings(BaseSettings):
     
     # Command Service settings
     COMMAND_SERVICE_URL: str = "http://command-execution:5000"
+    MAX_OUTPUT_CHARS: int = 65536
     
     # Logging settings
     LOG_LEVEL: str = "INFO"
@@ -16,6 +16,8 @@ class AgentPermissions:
     This class defines what operations an agent is allowed to perform.
     """
     
+    __slots__ = ("execute_commands", "allowed_commands", "allowed_paths", "memory_limit", "network_access")
+    
     def __init__(
         self,
         execute_commands: bool = False,
@@ -82,6 +84,11 @@ class Agent:
     This class represents an agent in the system.
     """
     
+    __slots__ = (
+        "id", "name", "description", "agent_type", "config", "permissions",
+        "user_id", "created_at", "updated_at"
+    )
+    
     def __init__(
         self,
         name: str,
@@ -178,6 +185,8 @@ class ExecutionStep:
     This class represents a step in an execution.
     """
     
+    __slots__ = ("id", "execution_id", "step_type", "content", "created_at")
+    
     def __init__(
         self,
         execution_id: str,
@@ -248,6 +257,11 @@ class Command:
     This class represents a command execution.
     """
     
+    __slots__ = (
+        "id", "execution_id", "command", "status", "exit_code", "stdout",
+        "stderr", "duration_ms", "created_at", "updated_at"
+    )
+    
     def __init__(
         self,
         execution_id: str,
@@ -347,6 +361,11 @@ class Execution:
     This class represents an agent execution.
     """
     
+    __slots__ = (
+        "id", "agent_id", "input", "status", "output", "error", "metadata",
+        "steps", "commands", "user_id", "created_at", "updated_at"
+    )
+    
     def __init__(
         self,
         agent_id: str,
@@ -425,13 +444,8 @@ class Execution:
         Returns:
             Execution instance
         """
-        steps = []
-        for step_data in data.get("steps", []):
-            steps.append(ExecutionStep.from_dict(step_data))
-            
-        commands = []
-        for command_data in data.get("commands", []):
-            commands.append(Command.from_dict(command_data))
+        steps = [ExecutionStep.from_dict(step_data) for step_data in data.get("steps", [])]
+        commands = [Command.from_dict(command_data) for command_data in data.get("commands", [])]
             
         created_at = data.get("created_at")
         if created_at and isinstance(created_at, str):
@@ -8,27 +8,92 @@ import logging
 import uuid
 import asyncio
 import time
+from collections import OrderedDict
 from datetime import datetime
 from typing import List, Dict, Any, Optional, AsyncIterator, Union, Tuple
 import json
 
+from app.core.config import settings
 from app.domain.repositories.agent_repository import AgentRepository
 from app.domain.repositories.execution_repository import ExecutionRepository
 from app.infrastructure.adapters.command_client import CommandClient
 from app.core.entities.agent import Agent, AgentType, AgentConfiguration, AgentPermissions
 from app.core.entities.execution import (
-    Execution, ExecutionStep, Command, 
-    ExecutionStatus, CommandStatus, StepType
+    Execution, ExecutionStatus, CommandStatus, StepType
 )
+from app.core.domain.entities import ExecutionStep, Command
 from app.core.agents.factory import AgentFactory
 from app.core.agents import (
     AgentResult,
-    AgentCallback
+    AgentCallback,
+    BaseAgent
 )
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Maximum number of undelivered events buffered per streaming execution
+STREAM_QUEUE_MAX_SIZE = 256
+
+# Number of buffered execution steps that triggers a write to the database
+STEP_BATCH_SIZE = 20
+
+# Maximum number of warm agent instances kept for reuse across executions
+AGENT_INSTANCE_CACHE_SIZE = 64
+
+# Agent instances keyed by (agent ID, updated_at), shared by all service
+# instances since the service itself is created per request
+_agent_instance_cache: "OrderedDict[Tuple[str, datetime], BaseAgent]" = OrderedDict()
+
+# Seconds execute_agent waits for a run to finish before canceling it
+EXECUTION_TIMEOUT = 300
+
+# Seconds a fetched agent is served from memory, and how many are kept
+AGENT_CACHE_TTL = 30.0
+AGENT_CACHE_SIZE = 4096
+
+# Fetched agents keyed by ID as (expiry on the monotonic clock, agent), with
+# one lock per ID so concurrent misses share a single database read; a lock
+# is dropped once no request holds or waits on it
+_agent_cache: "OrderedDict[str, Tuple[float, Agent]]" = OrderedDict()
+_agent_fetch_locks: Dict[str, asyncio.Lock] = {}
+_agent_fetch_waiters: Dict[str, int] = {}
+
+
+def _truncate(text: Optional[str], limit: int) -> Optional[str]:
+    """
+    Truncate command output to at most limit characters.
+    
+    Args:
+        text: Output to truncate
+        limit: Maximum number of characters to keep
+        
+    Returns:
+        The output, with a truncation marker if it was cut
+    """
+    if text is None or len(text) <= limit:
+        return text
+    return f"{text[:limit]}\n... truncated {len(text) - limit} characters"
+
+
+def _put_stream_event(queue: asyncio.Queue, event: Optional[str]) -> None:
+    """
+    Put an event on a bounded stream queue without blocking.
+    
+    When the consumer has fallen behind and the queue is full, the oldest
+    pending event is dropped so the producing agent is never stalled.
+    
+    Args:
+        queue: Stream queue
+        event: Serialized event, or None to signal end of stream
+    """
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        queue.get_nowait()
+        queue.put_nowait(event)
+        logger.warning("Stream queue full, dropped oldest event")
+
 
 class ExecutionCallback(AgentCallback):
     """Callback for tracking execution steps and commands."""
@@ -43,27 +108,47 @@ class ExecutionCallback(AgentCallback):
         """
         self.execution_id = execution_id
         self.execution_repository = execution_repository
+        self._pending_steps: List[ExecutionStep] = []
     
-    async def on_step(self, step_type: str, content: str) -> None:
+    async def on_step(
+        self,
+        step_type: str,
+        content: str,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
         """
         Handle execution step.
         
+        Steps are buffered and written in batches; call flush() once the
+        agent run is over to persist the remainder.
+        
         Args:
             step_type: Type of the step
             content: Content of the step
+            metadata: Optional metadata
         """
+        # Create step entity
+        self._pending_steps.append(ExecutionStep(
+            execution_id=self.execution_id,
+            step_type=step_type,
+            content=content
+        ))
+        
+        if len(self._pending_steps) >= STEP_BATCH_SIZE:
+            await self.flush()
+    
+    async def flush(self) -> None:
+        """
+        Save buffered execution steps to the database in a single write.
+        """
+        if not self._pending_steps:
+            return
+        
+        steps, self._pending_steps = self._pending_steps, []
         try:
-            # Create step entity
-            step = ExecutionStep(
-                execution_id=self.execution_id,
-                step_type=step_type,
-                content=content
-            )
-            
-            # Save step to database
-            await self.execution_repository.add_step(step)
+            await self.execution_repository.add_steps(steps)
         except Exception as e:
-            logger.error(f"Error saving execution step: {str(e)}", exc_info=True)
+            logger.error(f"Error saving execution steps: {str(e)}", exc_info=True)
     
     async def on_command(
         self,
@@ -72,7 +157,8 @@ class ExecutionCallback(AgentCallback):
         exit_code: Optional[int] = None,
         stdout: Optional[str] = None,
         stderr: Optional[str] = None,
-        duration_ms: Optional[int] = None
+        duration_ms: Optional[int] = None,
+        metadata: Optional[Dict[str, Any]] = None
     ) -> None:
         """
         Handle command execution.
@@ -84,16 +170,20 @@ class ExecutionCallback(AgentCallback):
             stdout: Command standard output
             stderr: Command standard error
             duration_ms: Command duration in milliseconds
+            metadata: Optional metadata
         """
+        # Persist the steps that led up to this command first
+        await self.flush()
+        
         try:
-            # Create command entity
+            # Create command entity with bounded output
             cmd = Command(
                 execution_id=self.execution_id,
                 command=command,
                 status=status,
                 exit_code=exit_code,
-                stdout=stdout,
-                stderr=stderr,
+                stdout=_truncate(stdout, settings.MAX_OUTPUT_CHARS),
+                stderr=_truncate(stderr, settings.MAX_OUTPUT_CHARS),
                 duration_ms=duration_ms
             )
             
@@ -158,8 +248,8 @@ class AgentService:
             ValueError: If the agent type is not supported or the configuration is invalid
         """
         # Validate agent type
-        available_types = self.agent_factory.get_available_agent_types()
-        if agent_type not in available_types:
+        if agent_type not in self.agent_factory.agent_types:
+            available_types = self.agent_factory.get_available_agent_types()
             raise ValueError(f"Unsupported agent type: {agent_type}. Available types: {', '.join(available_types)}")
         
         # Create default permissions if none provided
@@ -202,7 +292,7 @@ class AgentService:
         Returns:
             Agent or None if not found
         """
-        return await self.agent_repository.get_by_id(agent_id)
+        return await self._get_cached_agent(agent_id)
     
     async def update_agent(
         self,
@@ -229,7 +319,7 @@ class AgentService:
             ValueError: If the configuration is invalid
         """
         # Get agent
-        agent = await self.agent_repository.get_by_id(agent_id)
+        agent = await self._get_cached_agent(agent_id)
         if not agent:
             return None
         
@@ -257,6 +347,7 @@ class AgentService:
         
         # Update agent in database
         updated_agent = await self.agent_repository.update(agent_id, data)
+        _agent_cache.pop(agent_id, None)
         
         logger.info(f"Updated agent with ID {agent_id}")
         return updated_agent
@@ -273,6 +364,7 @@ class AgentService:
         """
         # Delete agent from database
         result = await self.agent_repository.delete(agent_id)
+        _agent_cache.pop(agent_id, None)
         
         if result:
             logger.info(f"Deleted agent with ID {agent_id}")
@@ -319,101 +411,6 @@ class AgentService:
             logger.error(f"Error listing agents: {str(e)}")
             raise
     
-    async def execute_agent(
-        self,
-        agent_id: str,
-        input: str,
-        user_id: Optional[str] = None
-    ) -> Execution:
-        """
-        Execute an agent.
-        
-        Args:
-            agent_id: Agent ID
-            input: Input for the agent
-            user_id: ID of the user who started the execution
-            
-        Returns:
-            Execution
-            
-        Raises:
-            ValueError: If the agent is not found
-        """
-        # Get agent
-        agent = await self.agent_repository.get_by_id(agent_id)
-        if not agent:
-            raise ValueError(f"Agent not found: {agent_id}")
-        
-        # Create execution entity
-        execution = Execution(
-            agent_id=agent_id,
-            input=input,
-            status="running",
-            user_id=user_id
-        )
-        
-        # Save execution to database
-        execution = await self.execution_repository.create(execution)
-        
-        # Create callback
-        callback = ExecutionCallback(execution.id, self.execution_repository)
-        
-        try:
-            # Create agent instance
-            agent_instance = self.agent_factory.create_agent(
-                agent_type=agent.agent_type,
-                config=agent.config,
-                permissions=agent.permissions
-            )
-            
-            # Execute agent
-            start_time = time.time()
-            
-            # Update execution status
-            await self.execution_repository.update_status(execution.id, "running")
-            
-            # Run agent
-            result = await agent_instance.run(input=input, callback=callback)
-            
-            # Calculate duration
-            duration_ms = int((time.time() - start_time) * 1000)
-            
-            # Determine status
-            status = "failed" if result.error else "completed"
-            
-            # Update execution
-            await self.execution_repository.update_status(
-                execution_id=execution.id,
-                status=status,
-                output=result.output,
-                error=result.error,
-                metadata={
-                    **(result.metadata or {}),
-                    "duration_ms": duration_ms
-                }
-            )
-            
-            # Get updated execution
-            execution = await self.execution_repository.get_by_id(execution.id)
-            
-            logger.info(f"Executed agent with ID {agent_id}, execution ID {execution.id}")
-            
-            return execution
-        except Exception as e:
-            logger.error(f"Error executing agent: {str(e)}", exc_info=True)
-            
-            # Update execution status
-            await self.execution_repository.update_status(
-                execution_id=execution.id,
-                status="failed",
-                error=str(e)
-            )
-            
-            # Get updated execution
-            execution = await self.execution_repository.get_by_id(execution.id)
-            
-            return execution
-    
     async def get_execution(self, execution_id: str) -> Optional[Execution]:
         """
         Get an execution by ID.
@@ -483,29 +480,12 @@ class AgentService:
         Raises:
             ValueError: If the agent is not found
         """
-        # Get agent
-        agent = await self.agent_repository.get_by_id(agent_id)
-        if not agent:
-            raise ValueError(f"Agent with ID {agent_id} not found")
-        
-        # Create execution
-        execution_id = str(uuid.uuid4())
-        execution = Execution(
-            id=execution_id,
-            agent_id=agent_id,
-            user_id=user_id,
-            input=input,
-            status=ExecutionStatus.PENDING,
-            metadata=metadata or {},
-            created_at=datetime.utcnow(),
-        )
-        
-        # Save execution
-        execution = await self.execution_repository.create(execution)
+        execution = await self._create_execution(agent_id, input, user_id, metadata)
+        execution_id = execution.id
         
         # If streaming, create a queue for this execution
         if streaming:
-            self._streaming_executions[execution_id] = asyncio.Queue()
+            self._streaming_executions[execution_id] = asyncio.Queue(maxsize=STREAM_QUEUE_MAX_SIZE)
         
         # Start execution in background task
         asyncio.create_task(self._execute_agent(execution_id, user_id, streaming))
@@ -535,76 +515,114 @@ class AgentService:
         Raises:
             ValueError: If the agent is not found or execution fails
         """
-        # Start execution
-        execution = await self.start_execution(agent_id, input, user_id, metadata)
+        execution = await self._create_execution(agent_id, input, user_id, metadata)
         
-        # Poll for completion
-        max_wait_time = 300  # 5 minutes
-        poll_interval = 1  # 1 second
-        waited = 0
+        # Run in this task and return the final status update's row,
+        # instead of polling the execution until it finishes
+        try:
+            updated_execution = await asyncio.wait_for(
+                self._execute_agent(execution.id, user_id, include_children=True),
+                timeout=EXECUTION_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            await self.cancel_execution(execution.id)
+            raise ValueError(f"Execution timed out after {EXECUTION_TIMEOUT} seconds")
+        
+        if not updated_execution:
+            raise ValueError(f"Execution with ID {execution.id} not found")
+        
+        return updated_execution
+    
+    async def _create_execution(
+        self,
+        agent_id: str,
+        input: str,
+        user_id: str,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Execution:
+        """
+        Create a pending execution for an agent.
         
-        while waited < max_wait_time:
-            # Get updated execution
-            updated_execution = await self.execution_repository.get_by_id(execution.id)
-            if not updated_execution:
-                raise ValueError(f"Execution with ID {execution.id} not found")
+        Args:
+            agent_id: Agent ID
+            input: User input
+            user_id: User ID
+            metadata: Optional metadata
             
-            # Check if completed or failed
-            if updated_execution.status in [ExecutionStatus.COMPLETED, ExecutionStatus.FAILED]:
-                return updated_execution
+        Returns:
+            Created execution
             
-            # Wait before polling again
-            await asyncio.sleep(poll_interval)
-            waited += poll_interval
+        Raises:
+            ValueError: If the agent is not found
+        """
+        # Get agent
+        agent = await self._get_cached_agent(agent_id)
+        if not agent:
+            raise ValueError(f"Agent with ID {agent_id} not found")
+        
+        # Create execution
+        execution = Execution(
+            id=str(uuid.uuid4()),
+            agent_id=agent_id,
+            user_id=user_id,
+            input=input,
+            status=ExecutionStatus.PENDING,
+            metadata=metadata or {},
+            created_at=datetime.utcnow(),
+        )
         
-        # Timeout
-        await self.cancel_execution(execution.id)
-        raise ValueError(f"Execution timed out after {max_wait_time} seconds")
+        # Save execution
+        return await self.execution_repository.create(execution)
     
     async def _execute_agent(
         self,
         execution_id: str,
         user_id: str,
-        streaming: bool = False
-    ) -> None:
+        streaming: bool = False,
+        include_children: bool = False
+    ) -> Optional[Execution]:
         """
         Execute an agent.
         
-        This method is called as a background task and updates the execution status.
+        This method is called as a background task, or awaited directly by
+        execute_agent, and updates the execution status.
         
         Args:
             execution_id: Execution ID
             user_id: User ID
             streaming: Whether to enable streaming
+            include_children: Whether to load steps and commands into the
+                returned execution
+            
+        Returns:
+            Execution as of its final status update, or None if not found
         """
         try:
-            # Get execution
-            execution = await self.execution_repository.get_by_id(execution_id)
+            # Update status to running; the returned row carries the agent
+            # ID and input, so the execution is not fetched separately
+            started_at = datetime.utcnow()
+            execution = await self.execution_repository.update_status(
+                execution_id=execution_id, 
+                status=ExecutionStatus.RUNNING.value,
+                include_children=False
+            )
             if not execution:
                 logger.error(f"Execution not found: {execution_id}")
                 return
             
             # Get agent
-            agent = await self.agent_repository.get_by_id(execution.agent_id)
+            agent = await self._get_cached_agent(execution.agent_id)
             if not agent:
                 logger.error(f"Agent not found: {execution.agent_id}")
-                await self.execution_repository.update_status(
+                return await self.execution_repository.update_status(
                     execution_id=execution_id, 
-                    status=ExecutionStatus.FAILED, 
-                    error="Agent not found"
+                    status=ExecutionStatus.FAILED.value, 
+                    error="Agent not found",
+                    include_children=include_children
                 )
-                return
-            
-            # Update status to running
-            started_at = datetime.utcnow()
-            execution = await self.execution_repository.update_status(
-                execution_id=execution_id, 
-                status=ExecutionStatus.RUNNING,
-                started_at=started_at
-            )
             
             # Send execution start event if streaming
-            if streaming:
+            if self.has_stream_subscriber(execution_id):
                 await self._send_stream_event(execution_id, {
                     "type": "status",
                     "status": ExecutionStatus.RUNNING.value,
@@ -612,36 +630,36 @@ class AgentService:
                     "started_at": started_at.isoformat(),
                 })
             
-            # Create agent instance
-            agent_instance = self.agent_factory.create_agent(
-                agent_type=agent.agent_type,
-                config=agent.config,
-                permissions=agent.permissions
-            )
+            # Get agent instance
+            agent_instance = self._get_agent_instance(agent)
             
             # Create callback to track steps and commands
             callback = ExecutionCallback(execution_id, self.execution_repository)
             
             # Run agent
-            result = await agent_instance.run(
-                input=execution.input,
-                callback=callback
-            )
+            try:
+                result = await agent_instance.run(
+                    input=execution.input,
+                    callback=callback
+                )
+            finally:
+                await callback.flush()
             
             # Update execution with result
             execution = await self.execution_repository.update_status(
                 execution_id=execution_id, 
-                status=ExecutionStatus.COMPLETED,
+                status=ExecutionStatus.COMPLETED.value,
                 output=result.output,
                 error=result.error,
                 metadata={
                     **(result.metadata or {}),
                     "duration_ms": int((datetime.utcnow() - started_at).total_seconds() * 1000)
-                }
+                },
+                include_children=include_children
             )
             
             # Send execution complete event if streaming
-            if streaming:
+            if self.has_stream_subscriber(execution_id):
                 await self._send_stream_event(execution_id, {
                     "type": "status",
                     "status": ExecutionStatus.COMPLETED.value,
@@ -649,33 +667,108 @@ class AgentService:
                     "output": result.output,
                     "error": result.error,
                     "duration_ms": execution.metadata.get("duration_ms"),
-                    "completed_at": execution.completed_at.isoformat() if execution.completed_at else None,
+                    "completed_at": execution.updated_at.isoformat() if execution.updated_at else None,
                 })
+            
+            return execution
         
         except Exception as e:
             logger.error(f"Error executing agent: {str(e)}", exc_info=True)
             
             # Update execution with error
-            await self.execution_repository.update_status(
+            execution = await self.execution_repository.update_status(
                 execution_id=execution_id, 
-                status=ExecutionStatus.FAILED,
+                status=ExecutionStatus.FAILED.value,
                 error=str(e),
-                completed_at=datetime.utcnow()
+                include_children=include_children
             )
             
             # Send execution error event if streaming
-            if streaming:
+            if self.has_stream_subscriber(execution_id):
                 await self._send_stream_event(execution_id, {
                     "type": "error",
                     "error": str(e),
                     "execution_id": execution_id,
                 })
+            
+            return execution
         
         finally:
             # Close streaming queue if streaming
             if streaming and execution_id in self._streaming_executions:
                 queue = self._streaming_executions.pop(execution_id)
-                await queue.put(None)  # Signal end of stream
+                _put_stream_event(queue, None)  # Signal end of stream
+    
+    def _get_agent_instance(self, agent: Agent) -> BaseAgent:
+        """
+        Get a warm agent instance, creating it on a cache miss.
+        
+        Keying on updated_at means an edited agent gets a fresh instance.
+        
+        Args:
+            agent: Agent to get an instance for
+            
+        Returns:
+            Agent instance
+        """
+        key = (agent.id, agent.updated_at)
+        agent_instance = _agent_instance_cache.get(key)
+        if agent_instance is not None:
+            _agent_instance_cache.move_to_end(key)
+            return agent_instance
+        
+        agent_instance = self.agent_factory.create_agent(
+            agent_type=agent.agent_type,
+            config=agent.config,
+            permissions=agent.permissions
+        )
+        _agent_instance_cache[key] = agent_instance
+        if len(_agent_instance_cache) > AGENT_INSTANCE_CACHE_SIZE:
+            _agent_instance_cache.popitem(last=False)
+        
+        return agent_instance
+    
+    async def _get_cached_agent(self, agent_id: str) -> Optional[Agent]:
+        """
+        Get an agent by ID, serving recent reads from the process cache.
+        
+        Updates and deletes through this service invalidate the entry;
+        changes made by other workers are picked up within AGENT_CACHE_TTL.
+        
+        Args:
+            agent_id: Agent ID
+            
+        Returns:
+            Agent or None if not found
+        """
+        entry = _agent_cache.get(agent_id)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        
+        lock = _agent_fetch_locks.setdefault(agent_id, asyncio.Lock())
+        _agent_fetch_waiters[agent_id] = _agent_fetch_waiters.get(agent_id, 0) + 1
+        try:
+            async with lock:
+                # Another request may have filled the entry while we waited
+                entry = _agent_cache.get(agent_id)
+                if entry is not None and entry[0] > time.monotonic():
+                    return entry[1]
+                
+                agent = await self.agent_repository.get_by_id(agent_id)
+                if agent is not None:
+                    _agent_cache[agent_id] = (time.monotonic() + AGENT_CACHE_TTL, agent)
+                    _agent_cache.move_to_end(agent_id)
+                    if len(_agent_cache) > AGENT_CACHE_SIZE:
+                        _agent_cache.popitem(last=False)
+                
+                return agent
+        finally:
+            # A released lock can still have queued waiters, so count them
+            # rather than asking the lock whether it is held
+            _agent_fetch_waiters[agent_id] -= 1
+            if not _agent_fetch_waiters[agent_id]:
+                del _agent_fetch_waiters[agent_id]
+                del _agent_fetch_locks[agent_id]
     
     async def _update_execution_status(
         self,
@@ -707,8 +800,7 @@ class AgentService:
             execution_id=execution_id,
             status=status.value,
             output=output,
-            error=error,
-            tokens_used=tokens_used
+            error=error
         )
         
         # If execution not found, create a dummy one to return
@@ -730,6 +822,20 @@ class AgentService:
         
         return execution
     
+    def has_stream_subscriber(self, execution_id: str) -> bool:
+        """
+        Check whether an execution has an open stream.
+        
+        Callers use this to skip building event payloads nobody will read.
+        
+        Args:
+            execution_id: Execution ID
+            
+        Returns:
+            True if events for the execution are being streamed
+        """
+        return execution_id in self._streaming_executions
+    
     async def _send_stream_event(
         self,
         execution_id: str,
@@ -738,13 +844,18 @@ class AgentService:
         """
         Send an event to the stream.
         
+        The event is serialized once here so consumers can forward the
+        JSON text as-is instead of encoding it again.
+        
         Args:
             execution_id: Execution ID
             event: Event data
         """
         queue = self._streaming_executions.get(execution_id)
-        if queue:
-            await queue.put(event)
+        if queue is not None:
+            _put_stream_event(queue, json.dumps(event))
+            # put_nowait never yields; give the consumer and other tasks a turn
+            await asyncio.sleep(0)
     
     async def cancel_execution(self, execution_id: str) -> Optional[Execution]:
         """
@@ -768,12 +879,11 @@ class AgentService:
         # Update execution status
         updated_execution = await self.execution_repository.update_status(
             execution_id=execution_id,
-            status=ExecutionStatus.CANCELED.value,
-            completed_at=datetime.utcnow()
+            status=ExecutionStatus.CANCELED.value
         )
         
         # Send execution canceled event if streaming
-        if execution_id in self._streaming_executions:
+        if self.has_stream_subscriber(execution_id):
             await self._send_stream_event(execution_id, {
                 "type": "status",
                 "status": ExecutionStatus.CANCELED.value,
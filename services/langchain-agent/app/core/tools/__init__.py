@@ -2,10 +2,21 @@
 Tools package.
 
 This package provides various tools for agents to use.
+
+Tool modules pull in LangChain when imported, so they are loaded on first
+attribute access rather than when the package is imported.
 """
 
-from app.core.tools.command_tool import CommandTool
+from typing import Any
 
 __all__ = [
     "CommandTool",
-] 
\ No newline at end of file
+]
+
+
+def __getattr__(name: str) -> Any:
+    """Lazily import tool classes on first access."""
+    if name == "CommandTool":
+        from app.core.tools.command_tool import CommandTool
+        return CommandTool
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
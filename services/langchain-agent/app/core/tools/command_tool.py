@@ -6,11 +6,11 @@ This module provides a command tool for executing system commands.
 
 import logging
 import json
-from typing import Any, Dict, List, Optional, Type, Callable, Awaitable
+from typing import Any, Dict, FrozenSet, List, Optional, Type, Callable, Awaitable
 import shlex
 
 from langchain.tools import BaseTool, StructuredTool, tool
-from langchain.pydantic_v1 import BaseModel, Field
+from langchain.pydantic_v1 import BaseModel, Field, PrivateAttr
 
 from app.infrastructure.adapters.command_client import CommandClient
 
@@ -37,6 +37,13 @@ class CommandTool(BaseTool):
     network_access: bool = False
     handle_command_callback: Optional[Callable[..., Awaitable[None]]] = None
     
+    _allowed_command_set: FrozenSet[str] = PrivateAttr(default_factory=frozenset)
+    
+    def __init__(self, **data: Any):
+        """Initialize the tool and index the allowed commands for lookup."""
+        super().__init__(**data)
+        self._allowed_command_set = frozenset(self.allowed_commands)
+    
     def _run(self, command: str) -> str:
         """Execute synchronous command (not supported)."""
         raise NotImplementedError("CommandTool only supports async execution")
@@ -52,11 +59,15 @@ class CommandTool(BaseTool):
             Command output as a string
         """
         try:
-            # Check if command is allowed
-            command_parts = shlex.split(command)
-            base_command = command_parts[0]
+            # Check if command is allowed, tokenizing only the base command
+            lexer = shlex.shlex(command, posix=True)
+            lexer.whitespace_split = True
+            lexer.commenters = ""
+            base_command = lexer.get_token()
+            if base_command is None:
+                raise ValueError("Empty command")
             
-            if self.allowed_commands and base_command not in self.allowed_commands:
+            if self._allowed_command_set and base_command not in self._allowed_command_set:
                 return f"Error: Command '{base_command}' is not allowed. Allowed commands: {', '.join(self.allowed_commands)}"
             
             # Validate with command service
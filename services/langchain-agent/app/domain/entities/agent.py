@@ -5,21 +5,48 @@ Defines the Agent entity representing a LangChain agent in the system.
 """
 
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, Optional, Any, Tuple
 from pydantic import BaseModel, Field, ConfigDict
 import uuid
 
 
+# Example shown in the generated JSON schema, built once at import
+_AGENT_EXAMPLE: Dict[str, Any] = {
+    "id": "agent-123456",
+    "name": "File System Manager",
+    "description": "Agent for managing file system operations",
+    "type": "command_execution",
+    "configuration": {
+        "model": "gpt-4",
+        "temperature": 0.2,
+        "max_tokens": 8192,
+        "tools": ["file_system", "search"]
+    },
+    "permissions": {
+        "allowed_commands": ["ls", "find", "grep"],
+        "allowed_paths": ["/home/user/data"],
+        "max_execution_time": 120
+    },
+    "metadata": {
+        "tags": ["file-system", "search"],
+        "version": "1.0.0"
+    },
+    "created_at": "2023-06-15T14:30:00Z",
+    "updated_at": "2023-06-15T14:30:00Z",
+    "created_by": "user-789"
+}
+
+
 class AgentPermissions(BaseModel):
     """
     Defines the permissions for agent execution.
     """
-    allowed_commands: List[str] = Field(
-        default_factory=list,
+    allowed_commands: Tuple[str, ...] = Field(
+        default=(),
         description="List of commands this agent is allowed to execute"
     )
-    allowed_paths: List[str] = Field(
-        default_factory=list,
+    allowed_paths: Tuple[str, ...] = Field(
+        default=(),
         description="List of file system paths this agent is allowed to access"
     )
     max_execution_time: int = Field(
@@ -52,8 +79,8 @@ class AgentConfiguration(BaseModel):
         default=4096,
         description="Maximum tokens for the LLM response"
     )
-    tools: List[str] = Field(
-        default_factory=list,
+    tools: Tuple[str, ...] = Field(
+        default=(),
         description="List of tools available to this agent"
     )
     memory_type: str = Field(
@@ -97,33 +124,4 @@ class Agent(BaseModel):
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     created_by: Optional[str] = Field(default=None, description="ID of the user who created this agent")
     
-    class Config:
-        """Pydantic config"""
-        model_config = ConfigDict(
-            json_schema_extra = {
-                "example": {
-                    "id": "agent-123456",
-                    "name": "File System Manager",
-                    "description": "Agent for managing file system operations",
-                    "type": "command_execution",
-                    "configuration": {
-                        "model": "gpt-4",
-                        "temperature": 0.2,
-                        "max_tokens": 8192,
-                        "tools": ["file_system", "search"]
-                    },
-                    "permissions": {
-                        "allowed_commands": ["ls", "find", "grep"],
-                        "allowed_paths": ["/home/user/data"],
-                        "max_execution_time": 120
-                    },
-                    "metadata": {
-                        "tags": ["file-system", "search"],
-                        "version": "1.0.0"
-                    },
-                    "created_at": "2023-06-15T14:30:00Z",
-                    "updated_at": "2023-06-15T14:30:00Z",
-                    "created_by": "user-789"
-                }
-            }
-        )
+    model_config = ConfigDict(json_schema_extra={"example": _AGENT_EXAMPLE})
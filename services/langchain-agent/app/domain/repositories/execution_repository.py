@@ -5,7 +5,7 @@ This module defines the interface for execution repositories.
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from app.core.entities.execution import Execution, ExecutionStep, Command
 
@@ -51,8 +51,8 @@ class ExecutionRepository(ABC):
         status: str, 
         output: Optional[str] = None,
         error: Optional[str] = None,
-        tokens_used: Optional[int] = None,
-        user_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        include_children: bool = True,
     ) -> Optional[Execution]:
         """
         Update the status of an execution.
@@ -62,8 +62,8 @@ class ExecutionRepository(ABC):
             status: The new status
             output: Optional output to set
             error: Optional error message to set
-            tokens_used: Optional number of tokens used
-            user_id: Optional user ID for access control
+            metadata: Optional metadata to merge into the stored metadata
+            include_children: Whether to load steps and commands into the result
             
         Returns:
             The updated execution if found, None otherwise
@@ -83,6 +83,19 @@ class ExecutionRepository(ABC):
         """
         pass
     
+    @abstractmethod
+    async def add_steps(self, steps: List[ExecutionStep]) -> List[ExecutionStep]:
+        """
+        Add several steps in a single write.
+        
+        Args:
+            steps: The steps to add, in order
+            
+        Returns:
+            The created steps with IDs and timestamps
+        """
+        pass
+    
     @abstractmethod
     async def add_command(self, command: Command) -> Command:
         """
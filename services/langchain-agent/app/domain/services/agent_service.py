@@ -37,11 +37,12 @@ class AgentService:
             The created agent.
         """
         # Create agent object from data
+        now = datetime.utcnow()
         agent = Agent(
             **agent_data,
             created_by=user_id,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
+            created_at=now,
+            updated_at=now
         )
         
         # Persist agent
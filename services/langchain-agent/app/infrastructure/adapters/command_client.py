@@ -2,9 +2,11 @@
 Client for interacting with the Command Execution Service.
 """
 
+import asyncio
 import json
 import logging
-from typing import Dict, Any, List, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 import aiohttp
 from aiohttp import ClientSession
 
@@ -12,6 +14,60 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Bound for short control calls (status, cancel, validate, ...) in seconds
+REQUEST_TIMEOUT = 30
+
+# Extra seconds an execute call may take beyond the command's own timeout
+COMMAND_TIMEOUT_GRACE = 5
+
+
+@lru_cache(maxsize=128)
+def _payload_prefix(
+    allowed_paths: Optional[Tuple[str, ...]],
+    memory_limit: Optional[int],
+    network_access: bool
+) -> bytes:
+    """
+    Build the serialized, per-agent invariant part of an execute payload.
+    
+    The returned bytes are a JSON object with its closing brace removed, so
+    the per-call ``command`` and ``timeout`` fields can be appended directly.
+    
+    Args:
+        allowed_paths: File system paths the command can access.
+        memory_limit: Memory limit in MB.
+        network_access: Whether the command has network access.
+        
+    Returns:
+        Open JSON object prefix.
+    """
+    payload: Dict[str, Any] = {"network_access": network_access}
+    
+    if allowed_paths:
+        payload["allowed_paths"] = list(allowed_paths)
+    
+    if memory_limit:
+        payload["memory_limit"] = memory_limit
+    
+    return json.dumps(payload).encode()[:-1]
+
+
+async def _read_json(response: aiohttp.ClientResponse) -> Any:
+    """
+    Decode a JSON response body straight from its raw bytes.
+    
+    ClientResponse.json() strips and decodes the body into intermediate
+    copies before parsing; json.loads handles UTF-8 bytes directly, which
+    matters for executions carrying large command output.
+    
+    Args:
+        response: Response whose body is JSON.
+        
+    Returns:
+        Decoded JSON value.
+    """
+    return json.loads(await response.read())
+
 
 class CommandClient:
     """
@@ -37,8 +93,17 @@ class CommandClient:
             aiohttp ClientSession
         """
         if self._session is None or self._session.closed:
+            # Pool keep-alive connections and cache DNS lookups so requests
+            # skip the TCP handshake
             self._session = aiohttp.ClientSession(
-                headers={"Content-Type": "application/json"}
+                headers={"Content-Type": "application/json"},
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=32,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=60
+                ),
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT, sock_connect=5)
             )
         return self._session
     
@@ -76,24 +141,31 @@ class CommandClient:
         """
         session = await self._get_session()
         
-        # Prepare request payload
-        payload = {
-            "command": command,
-            "timeout": timeout,
-            "network_access": network_access
-        }
-        
-        if allowed_paths:
-            payload["allowed_paths"] = allowed_paths
-        
-        if memory_limit:
-            payload["memory_limit"] = memory_limit
+        # Prepare request payload; only command and timeout vary per call
+        prefix = _payload_prefix(
+            tuple(allowed_paths) if allowed_paths else None,
+            memory_limit,
+            network_access
+        )
+        body = b"".join((
+            prefix,
+            b', "command": ',
+            json.dumps(command).encode(),
+            b', "timeout": ',
+            json.dumps(timeout).encode(),
+            b"}"
+        ))
         
         # Send request to Command Execution Service
         try:
             async with session.post(
                 f"{self.base_url}/api/commands/execute",
-                json=payload
+                data=body,
+                # A hung service must not outlive the command's own timeout
+                timeout=aiohttp.ClientTimeout(
+                    total=timeout + COMMAND_TIMEOUT_GRACE,
+                    sock_connect=5
+                )
             ) as response:
                 # Check for successful response
                 if response.status != 200:
@@ -102,8 +174,11 @@ class CommandClient:
                     raise Exception(f"Command execution failed with status {response.status}: {error_text}")
                 
                 # Parse response
-                result = await response.json()
+                result = await _read_json(response)
                 return result
+        except asyncio.TimeoutError:
+            logger.error(f"Command execution timed out after {timeout + COMMAND_TIMEOUT_GRACE}s")
+            raise Exception(f"Command execution timed out after {timeout + COMMAND_TIMEOUT_GRACE}s")
         except aiohttp.ClientError as e:
             logger.error(f"Error connecting to Command Execution Service: {str(e)}")
             raise Exception(f"Error connecting to Command Execution Service: {str(e)}")
@@ -134,7 +209,7 @@ class CommandClient:
                     raise Exception(f"Get execution status failed with status {response.status}: {error_text}")
                 
                 # Parse response
-                result = await response.json()
+                result = await _read_json(response)
                 return result
         except aiohttp.ClientError as e:
             logger.error(f"Error connecting to Command Execution Service: {str(e)}")
@@ -166,7 +241,7 @@ class CommandClient:
                     raise Exception(f"Cancel execution failed with status {response.status}: {error_text}")
                 
                 # Parse response
-                result = await response.json()
+                result = await _read_json(response)
                 return result
         except aiohttp.ClientError as e:
             logger.error(f"Error connecting to Command Execution Service: {str(e)}")
@@ -195,7 +270,7 @@ class CommandClient:
                     raise Exception(f"Get allowed commands failed with status {response.status}: {error_text}")
                 
                 # Parse response
-                result = await response.json()
+                result = await _read_json(response)
                 return result.get("allowed_commands", [])
         except aiohttp.ClientError as e:
             logger.error(f"Error connecting to Command Execution Service: {str(e)}")
@@ -219,7 +294,7 @@ class CommandClient:
         try:
             async with session.post(
                 f"{self.base_url}/api/commands/validate",
-                json={"command": command}
+                data=json.dumps({"command": command}).encode()
             ) as response:
                 # Check for successful response
                 if response.status != 200:
@@ -228,8 +303,22 @@ class CommandClient:
                     raise Exception(f"Command validation failed with status {response.status}: {error_text}")
                 
                 # Parse response
-                result = await response.json()
+                result = await _read_json(response)
                 return result
         except aiohttp.ClientError as e:
             logger.error(f"Error connecting to Command Execution Service: {str(e)}")
             raise Exception(f"Error connecting to Command Execution Service: {str(e)}")
+
+
+@lru_cache(maxsize=1)
+def get_command_client() -> CommandClient:
+    """
+    Get the process-wide command client.
+    
+    All agents share this client so they reuse one HTTP session and its
+    keep-alive connections to the Command Execution Service.
+    
+    Returns:
+        Shared CommandClient instance
+    """
+    return CommandClient(base_url=settings.COMMAND_SERVICE_URL)
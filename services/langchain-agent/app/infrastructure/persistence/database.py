@@ -4,11 +4,13 @@ Database connection.
 This module provides database connection functionality for the LangChain Agent Service.
 """
 
+import asyncio
 import logging
 from typing import AsyncGenerator, Optional
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, AsyncEngine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import (
+    create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine
+)
 
 from app.core.config import settings
 from app.infrastructure.persistence.models import Base
@@ -19,6 +21,9 @@ logger = logging.getLogger(__name__)
 # Global engine instance
 engine: Optional[AsyncEngine] = None
 
+# Global session factory, bound to the engine
+session_factory: Optional[async_sessionmaker] = None
+
 
 async def init_db() -> None:
     """
@@ -26,7 +31,7 @@ async def init_db() -> None:
     
     This function creates the database engine and initializes tables if they don't exist.
     """
-    global engine
+    global engine, session_factory
     try:
         # Create engine
         engine = create_async_engine(
@@ -35,7 +40,20 @@ async def init_db() -> None:
             pool_size=settings.DB_POOL_SIZE,
             max_overflow=settings.DB_MAX_OVERFLOW,
             pool_timeout=settings.DB_POOL_TIMEOUT,
-            pool_recycle=settings.DB_POOL_RECYCLE
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            # Keep prepared statements for the repeated repository queries
+            # so Postgres skips parse and plan on each execute
+            connect_args={
+                "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+                "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            }
+        )
+        
+        # Create session factory once for all requests
+        session_factory = async_sessionmaker(
+            bind=engine,
+            expire_on_commit=False,
+            autoflush=False
         )
         
         # Create tables if they don't exist
@@ -44,6 +62,10 @@ async def init_db() -> None:
                 logger.info("Creating database tables")
                 await conn.run_sync(Base.metadata.create_all)
         
+        # Open a few connections up front so the first requests don't pay
+        # the connection setup; the rest of the pool fills on demand
+        await _warm_pool(min(settings.DB_POOL_WARM_SIZE, settings.DB_POOL_SIZE))
+        
         logger.info(f"Database initialized: {settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}")
     
     except Exception as e:
@@ -51,16 +73,37 @@ async def init_db() -> None:
         raise
 
 
+async def _warm_pool(size: int) -> None:
+    """
+    Open ``size`` pooled connections by holding them at once.
+    
+    Args:
+        size: Number of connections to open
+    """
+    connections = await asyncio.gather(
+        *(engine.connect() for _ in range(size)),
+        return_exceptions=True
+    )
+    
+    # Return the opened connections to the pool
+    opened = [conn for conn in connections if not isinstance(conn, BaseException)]
+    await asyncio.gather(*(conn.close() for conn in opened))
+    
+    if len(opened) < size:
+        logger.warning(f"Database pool warmed with {len(opened)} of {size} connections")
+
+
 async def close_db() -> None:
     """
     Shutdown database connection.
     
     This function disposes the database engine.
     """
-    global engine
+    global engine, session_factory
     if engine:
         await engine.dispose()
         engine = None
+        session_factory = None
         logger.info("Database connection closed")
 
 
@@ -73,21 +116,11 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
     Yields:
         Database session
     """
-    global engine
     if not engine:
         await init_db()
     
-    # Create session factory
-    async_session = sessionmaker(
-        bind=engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-        autocommit=False,
-        autoflush=False
-    )
-    
     # Create and yield session
-    async with async_session() as session:
+    async with session_factory() as session:
         try:
             yield session
         except Exception as e:
@@ -5,19 +5,28 @@ This module provides SQLAlchemy models for database tables.
 """
 
 import uuid
-from datetime import datetime
 from typing import Dict, List, Optional, Any
 
 from sqlalchemy import (
     Column, String, Text, Boolean, Integer, 
-    DateTime, ForeignKey, JSON, Float,
+    DateTime, ForeignKey, Float, Index, Uuid,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from sqlalchemy.ext.declarative import declarative_base
 
 # Create base model
 Base = declarative_base()
 
+# Entity ids are stored as native 16-byte UUIDs but stay strings in Python
+IdType = Uuid(as_uuid=False)
+
+
+def _utc_now():
+    """Database-side naive UTC timestamp, matching datetime.utcnow()."""
+    return func.timezone("utc", func.now())
+
 
 class AgentModel(Base):
     """
@@ -27,19 +36,26 @@ class AgentModel(Base):
     """
     
     __tablename__ = "agents"
+    __table_args__ = (
+        # Serves list filters with the created_at ordering, avoiding a sort
+        Index("ix_agents_user_type_created", "user_id", "agent_type", "created_at"),
+    )
     
-    id = Column(String(36), primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
+    id = Column(IdType, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
     agent_type = Column(String(50), nullable=False)
-    config = Column(JSON, nullable=False, default=dict)
-    permissions = Column(JSON, nullable=False, default=dict)
+    config = Column(JSONB, nullable=False, default=dict)
+    permissions = Column(JSONB, nullable=False, default=dict)
     user_id = Column(String(36), nullable=True, index=True)
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, server_default=_utc_now())
+    updated_at = Column(DateTime, nullable=False, server_default=_utc_now(), onupdate=_utc_now())
     
-    # Relationships
-    executions = relationship("ExecutionModel", back_populates="agent", cascade="all, delete-orphan")
+    # Relationships are never lazy loaded; queries must eager load what they use
+    executions = relationship(
+        "ExecutionModel", back_populates="agent", cascade="all, delete-orphan",
+        lazy="raise", passive_deletes=True
+    )
     
     def __repr__(self) -> str:
         return f"<Agent id={self.id} name={self.name} type={self.agent_type}>"
@@ -53,22 +69,33 @@ class ExecutionModel(Base):
     """
     
     __tablename__ = "executions"
-    
-    id = Column(String(36), primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-    agent_id = Column(String(36), ForeignKey("agents.id", ondelete="CASCADE"), nullable=False, index=True)
+    __table_args__ = (
+        # Serve list filters with the created_at ordering, avoiding a sort
+        Index("ix_executions_user_status_created", "user_id", "status", "created_at"),
+        Index("ix_executions_agent_created", "agent_id", "created_at"),
+    )
+    
+    id = Column(IdType, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
+    agent_id = Column(IdType, ForeignKey("agents.id", ondelete="CASCADE"), nullable=False, index=True)
     input = Column(Text, nullable=False)
     status = Column(String(20), nullable=False, default="pending")
     output = Column(Text, nullable=True)
     error = Column(Text, nullable=True)
-    execution_metadata = Column(JSON, nullable=True)
+    execution_metadata = Column(JSONB, nullable=True)
     user_id = Column(String(36), nullable=True, index=True)
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
-    # Relationships
-    agent = relationship("AgentModel", back_populates="executions")
-    steps = relationship("ExecutionStepModel", back_populates="execution", cascade="all, delete-orphan")
-    commands = relationship("CommandModel", back_populates="execution", cascade="all, delete-orphan")
+    created_at = Column(DateTime, nullable=False, server_default=_utc_now())
+    updated_at = Column(DateTime, nullable=False, server_default=_utc_now(), onupdate=_utc_now())
+    
+    # Relationships are never lazy loaded; queries must eager load what they use
+    agent = relationship("AgentModel", back_populates="executions", lazy="raise")
+    steps = relationship(
+        "ExecutionStepModel", back_populates="execution", cascade="all, delete-orphan",
+        lazy="raise", passive_deletes=True
+    )
+    commands = relationship(
+        "CommandModel", back_populates="execution", cascade="all, delete-orphan",
+        lazy="raise", passive_deletes=True
+    )
     
     def __repr__(self) -> str:
         return f"<Execution id={self.id} agent_id={self.agent_id} status={self.status}>"
@@ -83,14 +110,14 @@ class ExecutionStepModel(Base):
     
     __tablename__ = "execution_steps"
     
-    id = Column(String(36), primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-    execution_id = Column(String(36), ForeignKey("executions.id", ondelete="CASCADE"), nullable=False, index=True)
+    id = Column(IdType, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
+    execution_id = Column(IdType, ForeignKey("executions.id", ondelete="CASCADE"), nullable=False, index=True)
     step_type = Column(String(50), nullable=False)
     content = Column(Text, nullable=False)
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, server_default=_utc_now())
     
     # Relationships
-    execution = relationship("ExecutionModel", back_populates="steps")
+    execution = relationship("ExecutionModel", back_populates="steps", lazy="raise")
     
     def __repr__(self) -> str:
         return f"<ExecutionStep id={self.id} execution_id={self.execution_id} type={self.step_type}>"
@@ -105,19 +132,19 @@ class CommandModel(Base):
     
     __tablename__ = "commands"
     
-    id = Column(String(36), primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
-    execution_id = Column(String(36), ForeignKey("executions.id", ondelete="CASCADE"), nullable=False, index=True)
+    id = Column(IdType, primary_key=True, index=True, default=lambda: str(uuid.uuid4()))
+    execution_id = Column(IdType, ForeignKey("executions.id", ondelete="CASCADE"), nullable=False, index=True)
     command = Column(Text, nullable=False)
     status = Column(String(20), nullable=False)
     exit_code = Column(Integer, nullable=True)
     stdout = Column(Text, nullable=True)
     stderr = Column(Text, nullable=True)
     duration_ms = Column(Integer, nullable=True)
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
-    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, server_default=_utc_now())
+    updated_at = Column(DateTime, nullable=False, server_default=_utc_now(), onupdate=_utc_now())
     
     # Relationships
-    execution = relationship("ExecutionModel", back_populates="commands")
+    execution = relationship("ExecutionModel", back_populates="commands", lazy="raise")
     
     def __repr__(self) -> str:
         return f"<Command id={self.id} execution_id={self.execution_id} status={self.status}>"
@@ -4,19 +4,22 @@ Repository implementations using SQLAlchemy for database operations.
 These classes implement the domain repository interfaces using SQLAlchemy.
 """
 
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Tuple, Union
 from datetime import datetime
 import json
 import logging
+import uuid
 
-from sqlalchemy import select, update, delete, func, and_, or_
+from sqlalchemy import select, insert, update, delete, func, and_, or_, bindparam, lambda_stmt, literal
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import contains_eager, selectinload
 
 from app.domain.repositories import AgentRepository, ExecutionRepository
-from app.domain.entities import (
-    Agent, AgentConfiguration, AgentPermissions,
-    Execution, ExecutionStatus, ExecutionStep, Command
+from app.core.domain.entities import (
+    Agent, AgentPermissions,
+    Execution, ExecutionStep, Command
 )
 from app.infrastructure.persistence.models import (
     AgentModel, ExecutionModel, ExecutionStepModel, CommandModel
@@ -25,69 +28,51 @@ from app.infrastructure.persistence.models import (
 # Configure logging
 logger = logging.getLogger(__name__)
 
-
-def agent_model_to_entity(model: AgentModel) -> Agent:
-    """Convert an AgentModel to an Agent entity."""
-    return Agent(
-        id=model.id,
-        name=model.name,
-        description=model.description,
-        type=model.type,
-        configuration=AgentConfiguration(**model.configuration),
-        permissions=AgentPermissions(**model.permissions),
-        metadata=model.metadata,
-        created_at=model.created_at,
-        updated_at=model.updated_at,
-        created_by=model.created_by
+# Fixed-shape lookups built once; lambda statements cache their compiled
+# form on the lambda, so executing them skips construct and cache-key work
+_SELECT_AGENT_BY_ID = lambda_stmt(
+    lambda: select(AgentModel).where(AgentModel.id == bindparam("id"))
+)
+# Execution columns read back by INSERT/UPDATE ... RETURNING
+_EXECUTION_COLUMNS = (
+    ExecutionModel.id, ExecutionModel.agent_id, ExecutionModel.input,
+    ExecutionModel.status, ExecutionModel.output, ExecutionModel.error,
+    ExecutionModel.execution_metadata, ExecutionModel.user_id,
+    ExecutionModel.created_at, ExecutionModel.updated_at
+)
+# Steps ride along on the execution query through a join; commands stay
+# on selectinload, since joining both collections multiplies every
+# command's output by the number of steps
+_SELECT_EXECUTION_BY_ID = lambda_stmt(
+    lambda: select(ExecutionModel)
+    .outerjoin(ExecutionModel.steps)
+    .where(ExecutionModel.id == bindparam("id"))
+    .options(
+        contains_eager(ExecutionModel.steps),
+        selectinload(ExecutionModel.commands)
     )
+)
 
 
-def execution_model_to_entity(model: ExecutionModel) -> Execution:
-    """Convert an ExecutionModel to an Execution entity."""
-    # Convert steps
-    steps = [
-        ExecutionStep(
-            id=step.id,
-            timestamp=step.timestamp,
-            type=step.type,
-            content=step.content,
-            metadata=step.metadata
-        )
-        for step in model.steps
-    ]
-    
-    # Convert commands
-    commands = [
-        Command(
-            id=command.id,
-            command=command.command,
-            timestamp=command.timestamp,
-            status=command.status,
-            exit_code=command.exit_code,
-            stdout=command.stdout,
-            stderr=command.stderr,
-            duration_ms=command.duration_ms,
-            metadata=command.metadata
-        )
-        for command in model.commands
-    ]
+def _is_valid_id(value: Union[str, uuid.UUID]) -> bool:
+    """
+    Check whether a value can be bound to a UUID id column.
     
-    return Execution(
-        id=model.id,
-        agent_id=model.agent_id,
-        user_id=model.user_id,
-        status=ExecutionStatus(model.status),
-        input=model.input,
-        output=model.output,
-        error=model.error,
-        steps=steps,
-        commands=commands,
-        tokens_used=model.tokens_used,
-        started_at=model.started_at,
-        completed_at=model.completed_at,
-        created_at=model.created_at,
-        metadata=model.metadata
-    )
+    Args:
+        value: Candidate ID
+        
+    Returns:
+        True if the value is a UUID or a valid UUID string
+    """
+    if isinstance(value, uuid.UUID):
+        return True
+    if not isinstance(value, str):
+        return False
+    try:
+        uuid.UUID(value)
+    except ValueError:
+        return False
+    return True
 
 
 class SQLAgentRepository(AgentRepository):
@@ -117,26 +102,28 @@ class SQLAgentRepository(AgentRepository):
             Created agent
         """
         try:
-            # Convert entity to model
-            agent_model = AgentModel(
-                id=agent.id,
-                name=agent.name,
-                description=agent.description,
-                agent_type=agent.agent_type,
-                config=agent.config,
-                permissions=agent.permissions.to_dict(),
-                user_id=agent.user_id,
-                created_at=agent.created_at,
-                updated_at=agent.updated_at
+            # Insert and read back the row in a single statement
+            query = (
+                insert(AgentModel)
+                .values(
+                    id=agent.id,
+                    name=agent.name,
+                    description=agent.description,
+                    agent_type=agent.agent_type,
+                    config=agent.config,
+                    permissions=agent.permissions.to_dict(),
+                    user_id=agent.user_id,
+                    created_at=agent.created_at,
+                    updated_at=agent.updated_at
+                )
+                .returning(*AgentModel.__table__.c)
             )
-            
-            # Add to session and commit
-            self.session.add(agent_model)
+            result = await self.session.execute(query)
+            row = result.one()
             await self.session.commit()
-            await self.session.refresh(agent_model)
             
             # Convert back to entity
-            return self._model_to_entity(agent_model)
+            return self._model_to_entity(row)
         
         except Exception as e:
             await self.session.rollback()
@@ -153,10 +140,13 @@ class SQLAgentRepository(AgentRepository):
         Returns:
             Agent or None if not found
         """
+        # Malformed IDs cannot match any row
+        if not _is_valid_id(agent_id):
+            return None
+        
         try:
             # Query the database
-            query = select(AgentModel).where(AgentModel.id == agent_id)
-            result = await self.session.execute(query)
+            result = await self.session.execute(_SELECT_AGENT_BY_ID, {"id": agent_id})
             agent_model = result.scalar_one_or_none()
             
             # Convert to entity if found
@@ -165,7 +155,10 @@ class SQLAgentRepository(AgentRepository):
             
             return None
         
-        except Exception as e:
+        except SQLAlchemyError as e:
+            # A failed statement aborts the transaction; roll back so the
+            # session stays usable for the caller's next query
+            await self.session.rollback()
             logger.error(f"Error getting agent by ID: {str(e)}", exc_info=True)
             raise
     
@@ -180,35 +173,39 @@ class SQLAgentRepository(AgentRepository):
         Returns:
             Updated agent or None if not found
         """
+        # Malformed IDs cannot match any row
+        if not _is_valid_id(agent_id):
+            return None
+        
         try:
-            # Query the database
-            query = select(AgentModel).where(AgentModel.id == agent_id)
-            result = await self.session.execute(query)
-            agent_model = result.scalar_one_or_none()
-            
-            # Return None if not found
-            if not agent_model:
-                return None
-            
-            # Update fields
+            # Build the update
+            values: Dict[str, Any] = {"updated_at": datetime.utcnow()}
             if "name" in data:
-                agent_model.name = data["name"]
+                values["name"] = data["name"]
             if "description" in data:
-                agent_model.description = data["description"]
+                values["description"] = data["description"]
             if "config" in data:
-                agent_model.config = data["config"]
+                values["config"] = data["config"]
             if "permissions" in data:
-                agent_model.permissions = data["permissions"].to_dict() if isinstance(data["permissions"], AgentPermissions) else data["permissions"]
+                values["permissions"] = data["permissions"].to_dict() if isinstance(data["permissions"], AgentPermissions) else data["permissions"]
             
-            # Update timestamp
-            agent_model.updated_at = datetime.utcnow()
-            
-            # Commit changes
+            # Update and read back the row in a single round trip
+            query = (
+                update(AgentModel)
+                .where(AgentModel.id == agent_id)
+                .values(**values)
+                .returning(*AgentModel.__table__.c)
+            )
+            result = await self.session.execute(query)
+            row = result.one_or_none()
             await self.session.commit()
-            await self.session.refresh(agent_model)
+            
+            # Return None if not found
+            if row is None:
+                return None
             
             # Convert back to entity
-            return self._model_to_entity(agent_model)
+            return self._model_to_entity(row)
         
         except Exception as e:
             await self.session.rollback()
@@ -225,21 +222,24 @@ class SQLAgentRepository(AgentRepository):
         Returns:
             True if deleted, False otherwise
         """
+        # Malformed IDs cannot match any row
+        if not _is_valid_id(agent_id):
+            return False
+        
         try:
-            # Query the database
-            query = select(AgentModel).where(AgentModel.id == agent_id)
-            result = await self.session.execute(query)
-            agent_model = result.scalar_one_or_none()
-            
-            # Return False if not found
-            if not agent_model:
-                return False
-            
-            # Delete the agent
-            await self.session.delete(agent_model)
+            # Delete the agent in a single round trip; its executions, steps
+            # and commands go with it through the ON DELETE CASCADE keys,
+            # which the models declare and migration 5c7a3f2e8b14 creates
+            result = await self.session.execute(
+                delete(AgentModel)
+                .where(AgentModel.id == agent_id)
+                .returning(AgentModel.id)
+            )
+            deleted = result.scalar_one_or_none() is not None
             await self.session.commit()
             
-            return True
+            # False if not found
+            return deleted
         
         except Exception as e:
             await self.session.rollback()
@@ -273,25 +273,34 @@ class SQLAgentRepository(AgentRepository):
             if agent_type:
                 filters.append(AgentModel.agent_type == agent_type)
             
-            # Create query for data
-            query = select(AgentModel)
+            # Create query for data, carrying the filtered total on every row;
+            # plain columns skip ORM instance hydration for a read-only page
+            query = select(*AgentModel.__table__.c, func.count().over().label("total"))
             if filters:
                 query = query.where(and_(*filters))
             query = query.order_by(AgentModel.created_at.desc()).offset(offset).limit(limit)
             
             # Execute query
             result = await self.session.execute(query)
-            agent_models = result.scalars().all()
+            rows = result.all()
             
             # Convert to entities
-            agents = [self._model_to_entity(model) for model in agent_models]
+            agents = [self._model_to_entity(row) for row in rows]
             
-            # Get total count
-            count = await self.count(user_id, agent_type)
+            # Get total count, only counting separately past the last page
+            if rows:
+                count = rows[0].total
+            elif offset:
+                count = await self.count(user_id, agent_type)
+            else:
+                count = 0
             
             return agents, count
         
-        except Exception as e:
+        except SQLAlchemyError as e:
+            # A failed statement aborts the transaction; roll back so the
+            # session stays usable for the caller's next query
+            await self.session.rollback()
             logger.error(f"Error listing agents: {str(e)}", exc_info=True)
             raise
     
@@ -324,21 +333,23 @@ class SQLAgentRepository(AgentRepository):
                 query = query.where(and_(*filters))
             
             # Execute query
-            result = await self.session.execute(query)
-            count = result.scalar_one()
+            count = await self.session.scalar(query)
             
             return count
         
-        except Exception as e:
+        except SQLAlchemyError as e:
+            # A failed statement aborts the transaction; roll back so the
+            # session stays usable for the caller's next query
+            await self.session.rollback()
             logger.error(f"Error counting agents: {str(e)}", exc_info=True)
             raise
     
-    def _model_to_entity(self, model: AgentModel) -> Agent:
+    def _model_to_entity(self, model: Any) -> Agent:
         """
         Convert agent model to entity.
         
         Args:
-            model: Agent model
+            model: Agent model, or a row with the agent columns
             
         Returns:
             Agent entity
@@ -385,27 +396,37 @@ class SQLExecutionRepository(ExecutionRepository):
             Created execution
         """
         try:
-            # Convert entity to model
-            execution_model = ExecutionModel(
-                id=execution.id,
-                agent_id=execution.agent_id,
-                input=execution.input,
-                status=execution.status,
-                output=execution.output,
-                error=execution.error,
-                metadata=execution.metadata,
-                user_id=execution.user_id,
-                created_at=execution.created_at,
-                updated_at=execution.updated_at
+            # Insert the execution and read back the row in one statement
+            query = (
+                insert(ExecutionModel)
+                .values(
+                    id=execution.id,
+                    agent_id=execution.agent_id,
+                    input=execution.input,
+                    status=execution.status,
+                    output=execution.output,
+                    error=execution.error,
+                    execution_metadata=execution.metadata,
+                    user_id=execution.user_id,
+                    created_at=execution.created_at,
+                    updated_at=execution.updated_at
+                )
+                .returning(*_EXECUTION_COLUMNS)
             )
+            result = await self.session.execute(query)
+            row = result.one()
             
-            # Add to session and commit
-            self.session.add(execution_model)
+            # Then its steps and commands as one multi-row INSERT each, all
+            # in a single transaction
+            await self._insert_steps(execution.steps)
+            await self._insert_commands(execution.commands)
             await self.session.commit()
-            await self.session.refresh(execution_model)
             
             # Convert back to entity
-            return self._model_to_entity(execution_model)
+            created_execution = self._row_to_entity(row)
+            created_execution.steps = list(execution.steps)
+            created_execution.commands = list(execution.commands)
+            return created_execution
         
         except Exception as e:
             await self.session.rollback()
@@ -422,18 +443,14 @@ class SQLExecutionRepository(ExecutionRepository):
         Returns:
             Execution or None if not found
         """
+        # Malformed IDs cannot match any row
+        if not _is_valid_id(execution_id):
+            return None
+        
         try:
             # Query the database
-            query = (
-                select(ExecutionModel)
-                .where(ExecutionModel.id == execution_id)
-                .options(
-                    selectinload(ExecutionModel.steps),
-                    selectinload(ExecutionModel.commands)
-                )
-            )
-            result = await self.session.execute(query)
-            execution_model = result.scalar_one_or_none()
+            result = await self.session.execute(_SELECT_EXECUTION_BY_ID, {"id": execution_id})
+            execution_model = result.unique().scalar_one_or_none()
             
             # Convert to entity if found
             if execution_model:
@@ -441,7 +458,10 @@ class SQLExecutionRepository(ExecutionRepository):
             
             return None
         
-        except Exception as e:
+        except SQLAlchemyError as e:
+            # A failed statement aborts the transaction; roll back so the
+            # session stays usable for the caller's next query
+            await self.session.rollback()
             logger.error(f"Error getting execution by ID: {str(e)}", exc_info=True)
             raise
     
@@ -451,7 +471,8 @@ class SQLExecutionRepository(ExecutionRepository):
         status: str,
         output: Optional[str] = None,
         error: Optional[str] = None,
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        include_children: bool = True
     ) -> Optional[Execution]:
         """
         Update execution status.
@@ -461,50 +482,61 @@ class SQLExecutionRepository(ExecutionRepository):
             status: New status
             output: Optional output
             error: Optional error
-            metadata: Optional metadata
+            metadata: Optional metadata, merged into the stored metadata
+            include_children: Whether to load steps and commands into the
+                returned execution
             
         Returns:
             Updated execution or None if not found
         """
+        # Malformed IDs cannot match any row
+        if not _is_valid_id(execution_id):
+            return None
+        
         try:
-            # Query the database
+            # Build the update
+            values: Dict[str, Any] = {
+                "status": status,
+                "updated_at": datetime.utcnow()
+            }
+            if output is not None:
+                values["output"] = output
+            if error is not None:
+                values["error"] = error
+            if metadata is not None:
+                # Merge metadata on the server, no read needed
+                values["execution_metadata"] = func.coalesce(
+                    ExecutionModel.execution_metadata, literal({}, JSONB)
+                ).op("||", return_type=JSONB)(literal(metadata, JSONB))
+            
+            # Update and read back the row in a single round trip
             query = (
-                select(ExecutionModel)
+                update(ExecutionModel)
                 .where(ExecutionModel.id == execution_id)
-                .options(
-                    selectinload(ExecutionModel.steps),
-                    selectinload(ExecutionModel.commands)
-                )
+                .values(**values)
+                .returning(*_EXECUTION_COLUMNS)
             )
-            result = await self.session.execute(query)
-            execution_model = result.scalar_one_or_none()
+            result = await self.session.execute(
+                query,
+                execution_options={"synchronize_session": False}
+            )
+            row = result.one_or_none()
+            await self.session.commit()
             
             # Return None if not found
-            if not execution_model:
+            if row is None:
                 return None
             
-            # Update fields
-            execution_model.status = status
-            if output is not None:
-                execution_model.output = output
-            if error is not None:
-                execution_model.error = error
-            if metadata is not None:
-                # Merge metadata
-                if execution_model.metadata:
-                    execution_model.metadata.update(metadata)
-                else:
-                    execution_model.metadata = metadata
-            
-            # Update timestamp
-            execution_model.updated_at = datetime.utcnow()
+            if not include_children:
+                return self._row_to_entity(row)
             
-            # Commit changes
-            await self.session.commit()
-            await self.session.refresh(execution_model)
-            
-            # Convert back to entity
-            return self._model_to_entity(execution_model)
+            # Reload with children, replacing any stale copy in the session
+            result = await self.session.execute(
+                _SELECT_EXECUTION_BY_ID,
+                {"id": execution_id},
+                execution_options={"populate_existing": True}
+            )
+            return self._model_to_entity(result.unique().scalar_one())
         
         except Exception as e:
             await self.session.rollback()
@@ -523,18 +555,12 @@ class SQLExecutionRepository(ExecutionRepository):
         """
         try:
             # Convert entity to model
-            step_model = ExecutionStepModel(
-                id=step.id,
-                execution_id=step.execution_id,
-                step_type=step.step_type,
-                content=step.content,
-                created_at=step.created_at
-            )
+            step_model = self._step_entity_to_model(step)
             
-            # Add to session and commit
+            # Add to session and commit; every value is set client side,
+            # so no refresh is needed
             self.session.add(step_model)
             await self.session.commit()
-            await self.session.refresh(step_model)
             
             # Convert back to entity
             return self._step_model_to_entity(step_model)
@@ -544,6 +570,32 @@ class SQLExecutionRepository(ExecutionRepository):
             logger.error(f"Error adding execution step: {str(e)}", exc_info=True)
             raise
     
+    async def add_steps(self, steps: List[ExecutionStep]) -> List[ExecutionStep]:
+        """
+        Add several steps in a single transaction.
+        
+        Args:
+            steps: Steps to add
+            
+        Returns:
+            Added steps
+        """
+        if not steps:
+            return []
+        
+        try:
+            # Insert the whole batch as one statement and commit once
+            await self._insert_steps(steps)
+            await self.session.commit()
+            
+            # All columns were set client-side, so the entities are complete
+            return list(steps)
+        
+        except Exception as e:
+            await self.session.rollback()
+            logger.error(f"Error adding execution steps: {str(e)}", exc_info=True)
+            raise
+    
     async def add_command(self, command: Command) -> Command:
         """
         Add a command to an execution.
@@ -556,23 +608,12 @@ class SQLExecutionRepository(ExecutionRepository):
         """
         try:
             # Convert entity to model
-            command_model = CommandModel(
-                id=command.id,
-                execution_id=command.execution_id,
-                command=command.command,
-                status=command.status,
-                exit_code=command.exit_code,
-                stdout=command.stdout,
-                stderr=command.stderr,
-                duration_ms=command.duration_ms,
-                created_at=command.created_at,
-                updated_at=command.updated_at
-            )
+            command_model = self._command_entity_to_model(command)
             
-            # Add to session and commit
+            # Add to session and commit; every value is set client side,
+            # so no refresh is needed
             self.session.add(command_model)
             await self.session.commit()
-            await self.session.refresh(command_model)
             
             # Convert back to entity
             return self._command_model_to_entity(command_model)
@@ -613,9 +654,9 @@ class SQLExecutionRepository(ExecutionRepository):
             if status:
                 filters.append(ExecutionModel.status == status)
             
-            # Create query for data
+            # Create query for data, carrying the filtered total on every row
             query = (
-                select(ExecutionModel)
+                select(ExecutionModel, func.count().over().label("total"))
                 .options(
                     selectinload(ExecutionModel.steps),
                     selectinload(ExecutionModel.commands)
@@ -627,17 +668,25 @@ class SQLExecutionRepository(ExecutionRepository):
             
             # Execute query
             result = await self.session.execute(query)
-            execution_models = result.scalars().all()
+            rows = result.all()
             
             # Convert to entities
-            executions = [self._model_to_entity(model) for model in execution_models]
+            executions = [self._model_to_entity(row[0]) for row in rows]
             
-            # Get total count
-            count = await self.count(agent_id, user_id, status)
+            # Get total count, only counting separately past the last page
+            if rows:
+                count = rows[0].total
+            elif offset:
+                count = await self.count(agent_id, user_id, status)
+            else:
+                count = 0
             
             return executions, count
         
-        except Exception as e:
+        except SQLAlchemyError as e:
+            # A failed statement aborts the transaction; roll back so the
+            # session stays usable for the caller's next query
+            await self.session.rollback()
             logger.error(f"Error listing executions: {str(e)}", exc_info=True)
             raise
     
@@ -674,12 +723,14 @@ class SQLExecutionRepository(ExecutionRepository):
                 query = query.where(and_(*filters))
             
             # Execute query
-            result = await self.session.execute(query)
-            count = result.scalar_one()
+            count = await self.session.scalar(query)
             
             return count
         
-        except Exception as e:
+        except SQLAlchemyError as e:
+            # A failed statement aborts the transaction; roll back so the
+            # session stays usable for the caller's next query
+            await self.session.rollback()
             logger.error(f"Error counting executions: {str(e)}", exc_info=True)
             raise
     
@@ -703,7 +754,7 @@ class SQLExecutionRepository(ExecutionRepository):
             status=model.status,
             output=model.output,
             error=model.error,
-            metadata=model.metadata,
+            metadata=model.execution_metadata,
             steps=steps,
             commands=commands,
             user_id=model.user_id,
@@ -711,6 +762,119 @@ class SQLExecutionRepository(ExecutionRepository):
             updated_at=model.updated_at
         )
     
+    async def _insert_steps(self, steps: List[ExecutionStep]) -> None:
+        """
+        Insert steps with a single bulk INSERT, bypassing the unit of work.
+        
+        Args:
+            steps: Steps to insert
+        """
+        if steps:
+            await self.session.execute(
+                insert(ExecutionStepModel),
+                [
+                    {
+                        "id": step.id,
+                        "execution_id": step.execution_id,
+                        "step_type": step.step_type,
+                        "content": step.content,
+                        "created_at": step.created_at,
+                    }
+                    for step in steps
+                ]
+            )
+    
+    async def _insert_commands(self, commands: List[Command]) -> None:
+        """
+        Insert commands with a single bulk INSERT, bypassing the unit of work.
+        
+        Args:
+            commands: Commands to insert
+        """
+        if commands:
+            await self.session.execute(
+                insert(CommandModel),
+                [
+                    {
+                        "id": command.id,
+                        "execution_id": command.execution_id,
+                        "command": command.command,
+                        "status": command.status,
+                        "exit_code": command.exit_code,
+                        "stdout": command.stdout,
+                        "stderr": command.stderr,
+                        "duration_ms": command.duration_ms,
+                        "created_at": command.created_at,
+                        "updated_at": command.updated_at,
+                    }
+                    for command in commands
+                ]
+            )
+    
+    def _step_entity_to_model(self, step: ExecutionStep) -> ExecutionStepModel:
+        """
+        Convert execution step entity to model.
+        
+        Args:
+            step: Execution step entity
+            
+        Returns:
+            Execution step model
+        """
+        return ExecutionStepModel(
+            id=step.id,
+            execution_id=step.execution_id,
+            step_type=step.step_type,
+            content=step.content,
+            created_at=step.created_at
+        )
+    
+    def _command_entity_to_model(self, command: Command) -> CommandModel:
+        """
+        Convert command entity to model.
+        
+        Args:
+            command: Command entity
+            
+        Returns:
+            Command model
+        """
+        return CommandModel(
+            id=command.id,
+            execution_id=command.execution_id,
+            command=command.command,
+            status=command.status,
+            exit_code=command.exit_code,
+            stdout=command.stdout,
+            stderr=command.stderr,
+            duration_ms=command.duration_ms,
+            created_at=command.created_at,
+            updated_at=command.updated_at
+        )
+    
+    def _row_to_entity(self, row: Any) -> Execution:
+        """
+        Convert an execution row without children to entity.
+        
+        Args:
+            row: Row with the execution columns
+            
+        Returns:
+            Execution entity with no steps or commands
+        """
+        return Execution(
+            id=row.id,
+            agent_id=row.agent_id,
+            input=row.input,
+            status=row.status,
+            output=row.output,
+            error=row.error,
+            metadata=row.execution_metadata,
+            user_id=row.user_id,
+            created_at=row.created_at,
+            updated_at=row.updated_at
+        )
+    
     def _step_model_to_entity(self, model: ExecutionStepModel) -> ExecutionStep:
         """
         Convert execution step model to entity.
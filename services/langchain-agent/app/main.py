@@ -11,10 +11,12 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+from sqlalchemy.exc import SQLAlchemyError
 
 from app.core.config import settings
 from app.api.v1 import api_router
 from app.infrastructure.persistence.database import init_db, close_db
+from app.infrastructure.adapters.command_client import get_command_client
 
 # Configure logging
 logging.basicConfig(
@@ -38,8 +40,9 @@ async def lifespan(app: FastAPI):
     
     yield
     
-    # Shutdown: close database connection
+    # Shutdown: close command client session and database connection
     logger.info("Shutting down application...")
+    await get_command_client().close()
     await close_db()
 
 
@@ -87,6 +90,25 @@ async def internal_error_handler(request: Request, exc: Exception):
         content={"detail": "Internal server error"},
     )
 
+# Add exception handler for database errors
+@app.exception_handler(SQLAlchemyError)
+async def database_error_handler(request: Request, exc: SQLAlchemyError):
+    """
+    Handle database errors that reach the API boundary.
+    
+    Args:
+        request: Request that caused the error
+        exc: Database exception that was raised
+        
+    Returns:
+        JSON response with error details
+    """
+    logger.error(f"Database error: {str(exc)}", exc_info=True)
+    return JSONResponse(
+        status_code=500,
+        content={"detail": "Database error"},
+    )
+
 # Include API router
 app.include_router(api_router)
 
@@ -0,0 +1,37 @@
+"""Add user_id and a composite index for agent list queries
+
+Revision ID: 7e2c9d5a1b48
+Revises: 6d8b4a3f9c25
+Create Date: 2026-10-16T00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7e2c9d5a1b48'
+down_revision = '6d8b4a3f9c25'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # The agent model filters lists by owner, which the migrated schema lacked
+    op.add_column('agents', sa.Column('user_id', sa.String(length=36), nullable=True))
+    op.create_index('ix_agents_user_id', 'agents', ['user_id'])
+
+    # Match the list filters and created_at ordering so pages need no sort
+    op.create_index(
+        'ix_agents_user_type_created',
+        'agents',
+        ['user_id', 'agent_type', 'created_at']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_agents_user_type_created', table_name='agents')
+    op.drop_index('ix_agents_user_id', table_name='agents')
+    op.drop_column('agents', 'user_id')
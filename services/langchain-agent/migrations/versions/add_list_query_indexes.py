@@ -0,0 +1,36 @@
+"""Add composite indexes for execution list queries
+
+Revision ID: 4b2e8c1d9f07
+Revises: 39ad7b47df59
+Create Date: 2026-10-16T00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '4b2e8c1d9f07'
+down_revision = '39ad7b47df59'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Match the list filters and created_at ordering so pages need no sort
+    op.create_index(
+        'ix_executions_user_status_created',
+        'executions',
+        ['user_id', 'status', 'created_at']
+    )
+    op.create_index(
+        'ix_executions_agent_created',
+        'executions',
+        ['agent_id', 'created_at']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_executions_agent_created', table_name='executions')
+    op.drop_index('ix_executions_user_status_created', table_name='executions')
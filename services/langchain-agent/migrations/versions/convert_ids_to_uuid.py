@@ -0,0 +1,99 @@
+"""Store entity ids as native UUID
+
+Every existing id must already be a valid UUID string; the upgrade checks
+this first and stops without changing anything if it is not. The
+upgrade also recreates the id foreign keys with ON DELETE CASCADE, as the
+models declare them; the downgrade restores the String(50) columns and
+plain keys of the initial schema.
+
+Revision ID: 5c7a3f2e8b14
+Revises: 4b2e8c1d9f07
+Create Date: 2026-10-16T00:00:00.000000
+
+"""
+from typing import Optional, Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '5c7a3f2e8b14'
+down_revision = '4b2e8c1d9f07'
+branch_labels = None
+depends_on = None
+
+# (table, column) pairs holding entity ids, parents before children
+ID_COLUMNS = [
+    ('agents', 'id'),
+    ('executions', 'id'),
+    ('executions', 'agent_id'),
+    ('execution_steps', 'id'),
+    ('execution_steps', 'execution_id'),
+    ('execution_commands', 'id'),
+    ('execution_commands', 'execution_id'),
+]
+
+# (constraint, table, column, referenced table) for foreign keys on ids
+FOREIGN_KEYS = [
+    ('executions_agent_id_fkey', 'executions', 'agent_id', 'agents'),
+    ('execution_steps_execution_id_fkey', 'execution_steps', 'execution_id', 'executions'),
+    ('execution_commands_execution_id_fkey', 'execution_commands', 'execution_id', 'executions'),
+]
+
+# Spellings accepted by the uuid type, compared case-insensitively
+UUID_PATTERN = r'^\{?[0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12}\}?$'
+
+
+def _check_ids() -> None:
+    # ::uuid aborts on the first bad value; report every offending column
+    # up front instead. Offline (--sql) runs have no data to check.
+    if context.is_offline_mode():
+        return
+    
+    bind = op.get_bind()
+    invalid = []
+    for table, column in ID_COLUMNS:
+        count = bind.execute(
+            sa.text(f"SELECT count(*) FROM {table} WHERE {column} !~* :pattern"),
+            {'pattern': UUID_PATTERN}
+        ).scalar()
+        if count:
+            invalid.append(f"{table}.{column} ({count} rows)")
+    
+    if invalid:
+        raise RuntimeError(
+            "Cannot convert ids to uuid, values that are not valid UUIDs found in "
+            f"{', '.join(invalid)}. Rewrite or remove those rows and run the "
+            "upgrade again."
+        )
+
+
+def _convert(type_, using: str, ondelete: Optional[str] = None) -> None:
+    # Foreign keys must be dropped while both sides change type
+    for name, table, _, _ in FOREIGN_KEYS:
+        op.drop_constraint(name, table, type_='foreignkey')
+    
+    for table, column in ID_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=type_,
+            postgresql_using=using.format(column=column)
+        )
+    
+    for name, table, column, referred_table in FOREIGN_KEYS:
+        op.create_foreign_key(
+            name, table, referred_table, [column], ['id'], ondelete=ondelete
+        )
+
+
+def upgrade() -> None:
+    _check_ids()
+    # Deleting an agent or execution removes its children in the database
+    _convert(postgresql.UUID(as_uuid=False), '{column}::uuid', ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    _convert(sa.String(length=50), '{column}::text')
@@ -0,0 +1,49 @@
+"""Store JSON documents as JSONB
+
+Revision ID: 6d8b4a3f9c25
+Revises: 5c7a3f2e8b14
+Create Date: 2026-10-16T00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '6d8b4a3f9c25'
+down_revision = '5c7a3f2e8b14'
+branch_labels = None
+depends_on = None
+
+# (table, column) pairs holding JSON documents
+JSON_COLUMNS = [
+    ('agents', 'configuration'),
+    ('agents', 'permissions'),
+    ('agents', 'metadata'),
+    ('executions', 'metadata'),
+    ('execution_steps', 'metadata'),
+    ('execution_commands', 'metadata'),
+]
+
+
+def upgrade() -> None:
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=postgresql.JSONB(),
+            postgresql_using=f'{column}::jsonb'
+        )
+
+
+def downgrade() -> None:
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.JSON(),
+            postgresql_using=f'{column}::json'
+        )
@@ -0,0 +1,258 @@
+"""
+Test the agent service execution flow.
+
+These tests drive AgentService against in-memory repositories whose
+update_status has the same signature as SQLExecutionRepository.update_status,
+so an unsupported keyword argument fails the test instead of leaving the
+execution stuck in pending.
+"""
+
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from app.core.agents import AgentResult
+from app.core.domain.entities import Execution
+from app.core.services import agent_service as agent_service_module
+from app.core.services.agent_service import AgentService
+
+
+class FakeExecutionRepository:
+    """In-memory execution repository recording every status update."""
+
+    def __init__(self, execution: Execution):
+        self.executions = {execution.id: execution}
+        self.status_updates: List[str] = []
+        self.fetches = 0
+        self.steps: List[Any] = []
+        self.commands: List[Any] = []
+
+    async def get_by_id(self, execution_id: str) -> Optional[Execution]:
+        self.fetches += 1
+        return self.executions.get(execution_id)
+
+    async def create(self, execution: Any) -> Any:
+        self.executions[execution.id] = execution
+        return execution
+
+    async def update_status(
+        self,
+        execution_id: str,
+        status: str,
+        output: Optional[str] = None,
+        error: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        include_children: bool = True
+    ) -> Optional[Execution]:
+        execution = self.executions.get(execution_id)
+        if execution is None:
+            return None
+
+        assert isinstance(status, str)
+        self.status_updates.append(status)
+        execution.status = status
+        if output is not None:
+            execution.output = output
+        if error is not None:
+            execution.error = error
+        if metadata is not None:
+            execution.metadata = {**execution.metadata, **metadata}
+        execution.updated_at = datetime.utcnow()
+        return execution
+
+    async def add_steps(self, steps: List[Any]) -> List[Any]:
+        self.steps.extend(steps)
+        return steps
+
+    async def add_command(self, command: Any) -> Any:
+        self.commands.append(command)
+        return command
+
+
+class FakeAgentRepository:
+    """In-memory agent repository."""
+
+    def __init__(self, agent: Any):
+        self.agent = agent
+
+    async def get_by_id(self, agent_id: str) -> Optional[Any]:
+        return self.agent if self.agent is not None and self.agent.id == agent_id else None
+
+
+class SlowAgentRepository:
+    """Agent repository that finds nothing after a delay, tracking overlapping reads."""
+
+    def __init__(self):
+        self.fetches = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_by_id(self, agent_id: str) -> Optional[Any]:
+        self.fetches += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return None
+
+
+class FakeAgent:
+    """Agent instance that records its input and returns a fixed result."""
+
+    def __init__(self, result: Optional[AgentResult] = None, exc: Optional[Exception] = None):
+        self.result = result
+        self.exc = exc
+        self.inputs: List[str] = []
+
+    async def run(self, input: str, callback: Any) -> AgentResult:
+        self.inputs.append(input)
+        await callback.on_step("thought", "thinking")
+        if self.exc is not None:
+            raise self.exc
+        return self.result
+
+
+class FakeAgentFactory:
+    """Factory that always hands out the same agent instance."""
+
+    def __init__(self, agent_instance: FakeAgent):
+        self.agent_instance = agent_instance
+
+    def create_agent(self, agent_type: Any, config: Any, permissions: Any) -> FakeAgent:
+        return self.agent_instance
+
+
+@pytest.fixture(autouse=True)
+def clear_agent_caches():
+    """Keep the process-wide agent caches from leaking between tests."""
+    agent_service_module._agent_cache.clear()
+    agent_service_module._agent_instance_cache.clear()
+    yield
+    agent_service_module._agent_cache.clear()
+    agent_service_module._agent_instance_cache.clear()
+
+
+def make_service(agent_instance: FakeAgent, agent_exists: bool = True):
+    agent = SimpleNamespace(
+        id="agent-1",
+        agent_type="conversational",
+        config={},
+        permissions=None,
+        updated_at=datetime(2024, 1, 1)
+    )
+    execution = Execution(
+        id="execution-1",
+        agent_id="agent-1",
+        input="list files",
+        status="pending",
+        user_id="user-1"
+    )
+    execution_repository = FakeExecutionRepository(execution)
+    service = AgentService(
+        agent_repository=FakeAgentRepository(agent if agent_exists else None),
+        execution_repository=execution_repository,
+        agent_factory=FakeAgentFactory(agent_instance)
+    )
+    return service, execution_repository
+
+
+@pytest.mark.asyncio
+async def test_execute_agent_completes_execution():
+    """A successful run moves the execution from pending to completed."""
+    agent_instance = FakeAgent(result=AgentResult(output="done", metadata={"tokens": 3}))
+    service, repository = make_service(agent_instance)
+
+    await service._execute_agent("execution-1", "user-1")
+
+    execution = repository.executions["execution-1"]
+    assert repository.status_updates == ["running", "completed"]
+    assert execution.status == "completed"
+    assert execution.output == "done"
+    assert execution.metadata["tokens"] == 3
+    assert "duration_ms" in execution.metadata
+    assert agent_instance.inputs == ["list files"]
+    assert len(repository.steps) == 1
+    # The running update's returned row replaces a separate fetch
+    assert repository.fetches == 0
+
+
+@pytest.mark.asyncio
+async def test_execute_agent_records_failure():
+    """An exception from the agent marks the execution as failed."""
+    agent_instance = FakeAgent(exc=RuntimeError("boom"))
+    service, repository = make_service(agent_instance)
+
+    await service._execute_agent("execution-1", "user-1")
+
+    execution = repository.executions["execution-1"]
+    assert repository.status_updates == ["running", "failed"]
+    assert execution.error == "boom"
+
+
+@pytest.mark.asyncio
+async def test_execute_agent_fails_when_agent_missing():
+    """An execution whose agent no longer exists is failed without running."""
+    agent_instance = FakeAgent(result=AgentResult(output="done"))
+    service, repository = make_service(agent_instance, agent_exists=False)
+
+    await service._execute_agent("execution-1", "user-1")
+
+    assert repository.status_updates == ["running", "failed"]
+    assert repository.executions["execution-1"].error == "Agent not found"
+    assert agent_instance.inputs == []
+
+
+@pytest.mark.asyncio
+async def test_execute_agent_streams_completion():
+    """The completion event is sent to an open stream and the stream closed."""
+    agent_instance = FakeAgent(result=AgentResult(output="done"))
+    service, repository = make_service(agent_instance)
+    queue = asyncio.Queue()
+    service._streaming_executions["execution-1"] = queue
+
+    await service._execute_agent("execution-1", "user-1", streaming=True)
+
+    events = []
+    while not queue.empty():
+        events.append(queue.get_nowait())
+    assert events[-1] is None
+    assert '"status": "completed"' in events[-2]
+    assert "execution-1" not in service._streaming_executions
+
+
+@pytest.mark.asyncio
+async def test_execute_agent_returns_final_update():
+    """execute_agent returns the completed execution without polling for it."""
+    agent_instance = FakeAgent(result=AgentResult(output="done"))
+    service, repository = make_service(agent_instance)
+
+    execution = await service.execute_agent("agent-1", "list files", "user-1")
+
+    assert execution.status == "completed"
+    assert execution.output == "done"
+    assert repository.executions[execution.id] is execution
+    assert repository.status_updates == ["running", "completed"]
+    assert repository.fetches == 0
+
+
+@pytest.mark.asyncio
+async def test_cached_agent_fetch_lock_outlives_queued_waiters():
+    """A request arriving while others still wait shares their lock."""
+    service, _ = make_service(FakeAgent())
+    repository = SlowAgentRepository()
+    service.agent_repository = repository
+
+    first = asyncio.create_task(service._get_cached_agent("missing"))
+    second = asyncio.create_task(service._get_cached_agent("missing"))
+    await first
+    # The first request has released the lock while the second still queues
+    third = asyncio.create_task(service._get_cached_agent("missing"))
+    await asyncio.gather(second, third)
+
+    assert repository.fetches == 3
+    assert repository.max_in_flight == 1
+    assert agent_service_module._agent_fetch_locks == {}
+    assert agent_service_module._agent_fetch_waiters == {}
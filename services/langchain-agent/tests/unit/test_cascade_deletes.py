@@ -0,0 +1,70 @@
+"""
+Test that child rows are deleted by the database.
+
+SQLAgentRepository.delete removes an agent with a single DELETE and the
+relationships use passive deletes, so executions, steps and commands are
+only removed through ON DELETE CASCADE foreign keys. Both the models and
+the migration chain must declare them.
+"""
+
+import importlib.util
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from app.infrastructure.persistence.models import (
+    CommandModel, ExecutionModel, ExecutionStepModel
+)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[2] / "migrations" / "versions"
+
+
+def load_migration(name: str):
+    """Import a migration module by file name."""
+    spec = importlib.util.spec_from_file_location(name, MIGRATIONS_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize("column, referred", [
+    (ExecutionModel.__table__.c.agent_id, "agents"),
+    (ExecutionStepModel.__table__.c.execution_id, "executions"),
+    (CommandModel.__table__.c.execution_id, "executions"),
+])
+def test_models_declare_cascading_foreign_keys(column, referred):
+    """Each child id column references its parent with ON DELETE CASCADE."""
+    (foreign_key,) = column.foreign_keys
+    assert foreign_key.column.table.name == referred
+    assert foreign_key.ondelete == "CASCADE"
+
+
+def test_uuid_migration_creates_cascading_foreign_keys():
+    """The upgrade recreates every id foreign key with ON DELETE CASCADE."""
+    migration = load_migration("convert_ids_to_uuid")
+
+    with mock.patch.object(migration, "op") as op, \
+            mock.patch.object(migration, "context") as context:
+        context.is_offline_mode.return_value = True
+        migration.upgrade()
+
+    created = {
+        call.args[0]: call.kwargs.get("ondelete")
+        for call in op.create_foreign_key.call_args_list
+    }
+    assert created == {name: "CASCADE" for name, _, _, _ in migration.FOREIGN_KEYS}
+
+
+def test_uuid_migration_downgrade_restores_plain_foreign_keys():
+    """The downgrade recreates the initial schema's keys without a cascade."""
+    migration = load_migration("convert_ids_to_uuid")
+
+    with mock.patch.object(migration, "op") as op:
+        migration.downgrade()
+
+    assert len(op.create_foreign_key.call_args_list) == len(migration.FOREIGN_KEYS)
+    assert all(
+        call.kwargs.get("ondelete") is None
+        for call in op.create_foreign_key.call_args_list
+    )
@@ -0,0 +1,401 @@
+"""
+Test the SQL repositories' statements.
+
+The repositories run against a session that records each statement and
+returns canned rows, and the recorded statements are compiled for the
+PostgreSQL dialect, so these tests need no database.
+"""
+
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, List, Optional
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.domain.entities import (
+    Agent, AgentPermissions, Command, Execution, ExecutionStep
+)
+from app.infrastructure.persistence.repositories import (
+    SQLAgentRepository, SQLExecutionRepository
+)
+
+
+class FakeResult:
+    """Result holding canned rows."""
+
+    def __init__(self, rows: Optional[List[Any]] = None):
+        self.rows = rows or []
+
+    def one(self) -> Any:
+        assert len(self.rows) == 1
+        return self.rows[0]
+
+    def one_or_none(self) -> Optional[Any]:
+        return self.rows[0] if self.rows else None
+
+    def all(self) -> List[Any]:
+        return list(self.rows)
+
+    def scalar_one_or_none(self) -> Optional[Any]:
+        return self.rows[0] if self.rows else None
+
+
+class ExecutionListRow(tuple):
+    """Row of (execution model, total) with the total also by name."""
+
+    def __new__(cls, model: Any, total: int):
+        row = super().__new__(cls, (model, total))
+        row.total = total
+        return row
+
+
+class RecordingSession:
+    """Session that records statements and returns queued results."""
+
+    def __init__(self, *results: FakeResult, scalar: Any = None):
+        self.results = list(results)
+        self.scalar_value = scalar
+        self.statements: List[Any] = []
+        self.params: List[Any] = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def execute(self, statement: Any, params: Any = None, execution_options: Any = None) -> FakeResult:
+        self.statements.append(statement)
+        self.params.append(params)
+        return self.results.pop(0) if self.results else FakeResult()
+
+    async def scalar(self, statement: Any) -> Any:
+        self.statements.append(statement)
+        self.params.append(None)
+        return self.scalar_value
+
+    async def commit(self) -> None:
+        self.commits += 1
+
+    async def rollback(self) -> None:
+        self.rollbacks += 1
+
+    def sql(self, index: int) -> str:
+        """Compile a recorded statement for PostgreSQL."""
+        return str(self.statements[index].compile(dialect=postgresql.dialect()))
+
+
+def agent_row(**overrides: Any) -> SimpleNamespace:
+    values = dict(
+        id=str(uuid.uuid4()),
+        name="Test Agent",
+        description="A test agent",
+        agent_type="conversational",
+        config={"model": "gpt-3.5-turbo"},
+        permissions=AgentPermissions().to_dict(),
+        user_id="user-1",
+        created_at=datetime(2024, 1, 1),
+        updated_at=datetime(2024, 1, 1),
+        total=1,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def execution_row(**overrides: Any) -> SimpleNamespace:
+    values = dict(
+        id=str(uuid.uuid4()),
+        agent_id=str(uuid.uuid4()),
+        input="list files",
+        status="running",
+        output=None,
+        error=None,
+        execution_metadata={},
+        user_id="user-1",
+        created_at=datetime(2024, 1, 1),
+        updated_at=datetime(2024, 1, 1),
+        steps=[],
+        commands=[],
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+@pytest.mark.asyncio
+async def test_create_agent_uses_returning():
+    """Creating an agent inserts and reads back the row in one statement."""
+    row = agent_row()
+    session = RecordingSession(FakeResult([row]))
+    agent = Agent(
+        name=row.name,
+        description=row.description,
+        agent_type=row.agent_type,
+        config=row.config,
+        permissions=AgentPermissions(),
+        user_id=row.user_id,
+        id=row.id,
+    )
+
+    created = await SQLAgentRepository(session).create(agent)
+
+    assert len(session.statements) == 1
+    sql = session.sql(0)
+    assert sql.startswith("INSERT INTO agents")
+    assert "RETURNING agents.id" in sql
+    assert session.commits == 1
+    assert created.id == row.id
+    assert created.name == row.name
+
+
+@pytest.mark.asyncio
+async def test_update_agent_uses_returning():
+    """Updating an agent reads back the row from UPDATE ... RETURNING."""
+    row = agent_row(name="Renamed")
+    session = RecordingSession(FakeResult([row]))
+
+    updated = await SQLAgentRepository(session).update(row.id, {"name": "Renamed"})
+
+    assert len(session.statements) == 1
+    sql = session.sql(0)
+    assert sql.startswith("UPDATE agents SET")
+    assert "WHERE agents.id = " in sql
+    assert "RETURNING agents.id" in sql
+    assert updated.name == "Renamed"
+
+
+@pytest.mark.asyncio
+async def test_update_missing_agent_returns_none():
+    """Updating an agent that matches no row returns None."""
+    session = RecordingSession(FakeResult([]))
+
+    assert await SQLAgentRepository(session).update(str(uuid.uuid4()), {"name": "x"}) is None
+    assert session.commits == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("rows, expected", [([str(uuid.uuid4())], True), ([], False)])
+async def test_delete_agent_uses_returning(rows, expected):
+    """Deleting an agent is one DELETE ... RETURNING id."""
+    session = RecordingSession(FakeResult(rows))
+
+    deleted = await SQLAgentRepository(session).delete(str(uuid.uuid4()))
+
+    assert deleted is expected
+    assert len(session.statements) == 1
+    sql = session.sql(0)
+    assert sql.startswith("DELETE FROM agents")
+    assert "RETURNING agents.id" in sql
+
+
+@pytest.mark.asyncio
+async def test_invalid_ids_skip_the_database():
+    """Malformed IDs return early without running a statement."""
+    session = RecordingSession()
+    agents = SQLAgentRepository(session)
+    executions = SQLExecutionRepository(session)
+
+    assert await agents.get_by_id("not-a-uuid") is None
+    assert await agents.update("not-a-uuid", {"name": "x"}) is None
+    assert await agents.delete("not-a-uuid") is False
+    assert await executions.get_by_id("not-a-uuid") is None
+    assert await executions.update_status("not-a-uuid", "failed") is None
+    assert session.statements == []
+
+
+@pytest.mark.asyncio
+async def test_list_agents_counts_with_window():
+    """Listing agents carries the total on each row via count(*) OVER ()."""
+    rows = [agent_row(total=7), agent_row(total=7)]
+    session = RecordingSession(FakeResult(rows))
+
+    agents, total = await SQLAgentRepository(session).list(
+        user_id="user-1", agent_type="conversational", offset=0, limit=2
+    )
+
+    assert len(session.statements) == 1
+    sql = session.sql(0)
+    assert "count(*) OVER () AS total" in sql
+    assert "WHERE agents.user_id = " in sql
+    assert "AND agents.agent_type = " in sql
+    assert "ORDER BY agents.created_at DESC" in sql
+    assert [agent.id for agent in agents] == [row.id for row in rows]
+    assert total == 7
+
+
+@pytest.mark.asyncio
+async def test_list_agents_counts_separately_past_last_page():
+    """An empty page past the end falls back to a COUNT query."""
+    session = RecordingSession(FakeResult([]), scalar=3)
+
+    agents, total = await SQLAgentRepository(session).list(offset=10, limit=10)
+
+    assert agents == []
+    assert total == 3
+    assert len(session.statements) == 2
+    assert session.sql(1).startswith("SELECT count(*) AS count_1")
+
+
+@pytest.mark.asyncio
+async def test_list_agents_empty_first_page_skips_count():
+    """An empty first page needs no COUNT query."""
+    session = RecordingSession(FakeResult([]), scalar=3)
+
+    agents, total = await SQLAgentRepository(session).list()
+
+    assert (agents, total) == ([], 0)
+    assert len(session.statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_list_executions_counts_with_window():
+    """Listing executions carries the total on each row via count(*) OVER ()."""
+    row = execution_row()
+    session = RecordingSession(FakeResult([ExecutionListRow(row, 4)]))
+
+    executions, total = await SQLExecutionRepository(session).list(status="running")
+
+    sql = session.sql(0)
+    assert "count(*) OVER () AS total" in sql
+    assert "WHERE executions.status = " in sql
+    assert "ORDER BY executions.created_at DESC" in sql
+    assert [execution.id for execution in executions] == [row.id]
+    assert total == 4
+
+
+@pytest.mark.asyncio
+async def test_create_execution_inserts_children_in_bulk():
+    """Creating an execution is one INSERT ... RETURNING plus one INSERT per child table."""
+    row = execution_row()
+    steps = [
+        ExecutionStep(execution_id=row.id, step_type="thought", content=f"step {i}")
+        for i in range(3)
+    ]
+    commands = [
+        Command(execution_id=row.id, command="ls", status="completed", exit_code=0),
+        Command(execution_id=row.id, command="pwd", status="completed", exit_code=0),
+    ]
+    execution = Execution(
+        id=row.id,
+        agent_id=row.agent_id,
+        input=row.input,
+        status=row.status,
+        steps=steps,
+        commands=commands,
+        user_id=row.user_id,
+    )
+    session = RecordingSession(FakeResult([row]))
+
+    created = await SQLExecutionRepository(session).create(execution)
+
+    assert len(session.statements) == 3
+    assert session.sql(0).startswith("INSERT INTO executions")
+    assert "RETURNING executions.id" in session.sql(0)
+    assert session.sql(1).startswith("INSERT INTO execution_steps")
+    assert [params["content"] for params in session.params[1]] == ["step 0", "step 1", "step 2"]
+    assert session.sql(2).startswith("INSERT INTO commands")
+    assert [params["command"] for params in session.params[2]] == ["ls", "pwd"]
+    assert session.commits == 1
+    assert created.steps == steps
+    assert created.commands == commands
+
+
+@pytest.mark.asyncio
+async def test_create_execution_without_children_is_one_statement():
+    """No child INSERTs are issued when there are no steps or commands."""
+    row = execution_row()
+    session = RecordingSession(FakeResult([row]))
+
+    await SQLExecutionRepository(session).create(
+        Execution(id=row.id, agent_id=row.agent_id, input=row.input)
+    )
+
+    assert len(session.statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_add_steps_is_one_insert_and_commit():
+    """A batch of steps is written with one INSERT and one commit."""
+    execution_id = str(uuid.uuid4())
+    steps = [
+        ExecutionStep(execution_id=execution_id, step_type="thought", content="a"),
+        ExecutionStep(execution_id=execution_id, step_type="action", content="b"),
+    ]
+    session = RecordingSession()
+
+    added = await SQLExecutionRepository(session).add_steps(steps)
+
+    assert added == steps
+    assert len(session.statements) == 1
+    assert session.sql(0).startswith("INSERT INTO execution_steps")
+    assert [params["id"] for params in session.params[0]] == [step.id for step in steps]
+    assert session.commits == 1
+
+
+@pytest.mark.asyncio
+async def test_add_steps_empty_batch_skips_the_database():
+    """An empty batch runs nothing and commits nothing."""
+    session = RecordingSession()
+
+    assert await SQLExecutionRepository(session).add_steps([]) == []
+    assert session.statements == []
+    assert session.commits == 0
+
+
+@pytest.mark.asyncio
+async def test_update_status_uses_returning_without_children():
+    """A status update without children is a single UPDATE ... RETURNING."""
+    row = execution_row(status="completed", output="done")
+    session = RecordingSession(FakeResult([row]))
+
+    execution = await SQLExecutionRepository(session).update_status(
+        row.id, "completed", output="done", include_children=False
+    )
+
+    assert len(session.statements) == 1
+    sql = session.sql(0)
+    assert sql.startswith("UPDATE executions SET")
+    assert "RETURNING executions.id" in sql
+    assert "||" not in sql
+    assert execution.status == "completed"
+    assert execution.output == "done"
+    assert execution.steps == []
+
+
+@pytest.mark.asyncio
+async def test_update_status_merges_metadata_on_the_server():
+    """Metadata is merged with the JSONB || operator instead of read first."""
+    row = execution_row(execution_metadata={"duration_ms": 5})
+    session = RecordingSession(FakeResult([row]))
+
+    await SQLExecutionRepository(session).update_status(
+        row.id, "completed", metadata={"duration_ms": 5}, include_children=False
+    )
+
+    sql = session.sql(0)
+    assert "coalesce(executions.execution_metadata, " in sql
+    assert " || " in sql
+
+
+@pytest.mark.asyncio
+async def test_update_status_missing_execution_returns_none():
+    """An update that matches no row returns None without reloading."""
+    session = RecordingSession(FakeResult([]))
+
+    assert await SQLExecutionRepository(session).update_status(str(uuid.uuid4()), "failed") is None
+    assert len(session.statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_write_rolls_back():
+    """A failing statement rolls the session back and is re-raised."""
+    session = RecordingSession()
+
+    async def failing_execute(*args: Any, **kwargs: Any) -> None:
+        raise RuntimeError("boom")
+
+    session.execute = failing_execute
+    with pytest.raises(RuntimeError):
+        await SQLExecutionRepository(session).add_steps([
+            ExecutionStep(execution_id=str(uuid.uuid4()), step_type="thought", content="a")
+        ])
+
+    assert session.rollbacks == 1
+    assert session.commits == 0